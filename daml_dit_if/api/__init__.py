@@ -4,7 +4,7 @@ import abc
 import logging
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Awaitable, Callable, Optional, Sequence
+from typing import Any, Awaitable, Callable, List, Optional, Sequence, Tuple
 
 from aiohttp.helpers import sentinel
 from aiohttp.web import Response
@@ -43,6 +43,8 @@ class IntegrationResponse:
 
 
 class IntegrationQueueSink:
+    __slots__ = ()
+
     @abc.abstractmethod
     async def put(self, message: Any, queue_name: str = "default"):
         """
@@ -51,8 +53,19 @@ class IntegrationQueueSink:
         """
         pass
 
+    @abc.abstractmethod
+    def put_nowait(self, message: Any, queue_name: str = "default"):
+        """
+        Put a message onto the internal message queue with the given name,
+        without awaiting. Throws an exception if there is no queue of that
+        name.
+        """
+        pass
+
 
 class IntegrationQueueEvents:
+    __slots__ = ()
+
     @abc.abstractmethod
     def message(self, queue_name: str = "default"):
         """
@@ -79,13 +92,39 @@ class IntegrationTimeEvents:
         pass
 
 
+class _FrozenSlots:
+    """
+    Copy and pickle support for frozen dataclasses that declare their
+    own ``__slots__``. Without it, restoring the state of such an instance
+    assigns each slot in turn and trips the frozen check.
+    """
+
+    __slots__ = ()
+
+    def __getstate__(self):
+        state = {}
+
+        for cls in type(self).__mro__:
+            for name in cls.__dict__.get("__slots__", ()):
+                if hasattr(self, name):
+                    state[name] = getattr(self, name)
+
+        return state
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
+
 @dataclass(frozen=True)
-class IntegrationLedgerContractEvent:
+class IntegrationLedgerContractEvent(_FrozenSlots):
     """
     Base class for ledger integration events related to actions taken
     on contracts.
     """
 
+    __slots__ = ("cid",)
+
     cid: ContractId
 
 
@@ -101,6 +140,8 @@ class IntegrationLedgerContractCreateEvent(IntegrationLedgerContractEvent):
     :class:`IntegrationLedgerContractArchiveEvent` for the CID.
     """
 
+    __slots__ = ("initial", "cdata")
+
     initial: bool
     cdata: ContractData
 
@@ -114,17 +155,78 @@ class IntegrationLedgerContractArchiveEvent(IntegrationLedgerContractEvent):
     :class:`IntegrationLedgerContractCreateEvent` for the contract.
     """
 
+    __slots__ = ()
+
 
 @dataclass(frozen=True)
-class IntegrationLedgerTransactionEvent:
+class IntegrationLedgerTransactionEvent(_FrozenSlots):
     """
-    Base class for transaction boundary events.
+    Base class for transaction boundary events. In addition to the
+    ``contract_events`` sequence, the contracts created and archived
+    within the transaction are available as parallel tuples through
+    :attr:`created_cids`, :attr:`created_cdata` and :attr:`archived_cids`.
     """
 
+    __slots__ = ("command_id", "workflow_id", "contract_events", "_partitioned")
+
     command_id: str
     workflow_id: str
     contract_events: Sequence[IntegrationLedgerContractEvent]
 
+    def __post_init__(self):
+        if not isinstance(self.contract_events, tuple):
+            object.__setattr__(self, "contract_events", tuple(self.contract_events))
+
+    def _partition(
+        self,
+    ) -> Tuple[
+        Tuple[ContractId, ...], Tuple[ContractData, ...], Tuple[ContractId, ...]
+    ]:
+        partitioned = getattr(self, "_partitioned", None)
+        if partitioned is not None:
+            return partitioned
+
+        created_cids = []  # type: List[ContractId]
+        created_cdata = []  # type: List[ContractData]
+        archived_cids = []  # type: List[ContractId]
+
+        for event in self.contract_events:
+            if isinstance(event, IntegrationLedgerContractCreateEvent):
+                created_cids.append(event.cid)
+                created_cdata.append(event.cdata)
+            elif isinstance(event, IntegrationLedgerContractArchiveEvent):
+                archived_cids.append(event.cid)
+
+        partitioned = (tuple(created_cids), tuple(created_cdata), tuple(archived_cids))
+
+        # The partition is computed on first use and kept in a slot that
+        # is not a dataclass field, so it does not affect eq or repr.
+        object.__setattr__(self, "_partitioned", partitioned)
+
+        return partitioned
+
+    @property
+    def created_cids(self) -> Tuple[ContractId, ...]:
+        """
+        The IDs of the contracts created within this transaction.
+        """
+        return self._partition()[0]
+
+    @property
+    def created_cdata(self) -> Tuple[ContractData, ...]:
+        """
+        The data of the contracts created within this transaction, in the
+        same order as :attr:`created_cids`.
+        """
+        return self._partition()[1]
+
+    @property
+    def archived_cids(self) -> Tuple[ContractId, ...]:
+        """
+        The IDs of the contracts archived within this transaction.
+        """
+        return self._partition()[2]
+
 
 @dataclass(frozen=True)
 class IntegrationLedgerTransactionStartEvent(IntegrationLedgerTransactionEvent):
@@ -134,6 +236,8 @@ class IntegrationLedgerTransactionStartEvent(IntegrationLedgerTransactionEvent):
     a matching transaction end event.
     """
 
+    __slots__ = ()
+
 
 @dataclass(frozen=True)
 class IntegrationLedgerTransactionEndEvent(IntegrationLedgerTransactionEvent):
@@ -143,8 +247,12 @@ class IntegrationLedgerTransactionEndEvent(IntegrationLedgerTransactionEvent):
     a matching transaction start event occurring earlier in the event stream.
     """
 
+    __slots__ = ()
+
 
 class IntegrationLedgerEvents:
+    __slots__ = ()
+
     @abc.abstractmethod
     def ledger_init(self):
         """
@@ -1,7 +1,13 @@
 from __future__ import annotations
 
+import json
 import logging
-from typing import Any, Optional
+import sys
+from enum import Enum
+from functools import lru_cache
+from math import isfinite
+from typing import Any, Optional, Type, TypeVar, Union
+from uuid import UUID
 
 from aiohttp import web
 from aiohttp.helpers import sentinel
@@ -11,27 +17,112 @@ from dazl.damlast.lookup import parse_type_con_name
 from dazl.damlast.util import package_ref
 from dazl.prim.json import JSONEncoder
 
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:  # pragma: no cover
+    HAS_ORJSON = False
+
 LOG = logging.getLogger("daml-dit-if")
 
 
-def ensure_package_id(daml_model: Optional[DamlModelInfo], template: str) -> str:
+@lru_cache(maxsize=512)
+def _resolve_package_id(template: str, default_package_id: Optional[str]) -> str:
+    # Resolved names are interned, so that the template keys dazl
+    # compares and hashes for every event are shared string objects.
     if template == "*":
-        return template
+        return sys.intern(template)
 
     package = package_ref(parse_type_con_name(template))
 
     if package != "*":
-        return template
+        return sys.intern(template)
 
-    if daml_model is None:
+    if default_package_id is None:
         raise Exception(
             f"No default model {package} known when ensuring package ID: {template}"
         )
     else:
-        return f"{daml_model.main_package_id}:{template}"
+        return sys.intern(f"{default_package_id}:{template}")
+
+
+def ensure_package_id(daml_model: Optional[DamlModelInfo], template: str) -> str:
+    return _resolve_package_id(
+        template, daml_model.main_package_id if daml_model else None
+    )
+
+
+_LEDGER_ENCODER = JSONEncoder()
+
+
+def _encode_default(obj: Any) -> Any:
+    # Both encoders call this for values they do not serialize natively.
+    # Enums and UUIDs are written as orjson writes them itself, so that
+    # either encoder accepts the same values, and anything else is left
+    # to the ledger encoder.
+    if isinstance(obj, Enum):
+        return obj.value
+    elif isinstance(obj, UUID):
+        return str(obj)
+
+    return _LEDGER_ENCODER.default(obj)
 
 
-DEFAULT_ENCODER = JSONEncoder()
+DEFAULT_ENCODER = JSONEncoder(default=_encode_default)
+
+
+def _has_non_finite_float(data: Any) -> bool:
+    if isinstance(data, float):
+        return not isfinite(data)
+    elif isinstance(data, dict):
+        return any(_has_non_finite_float(value) for value in data.values())
+    elif isinstance(data, (list, tuple)):
+        return any(_has_non_finite_float(value) for value in data)
+    else:
+        return False
+
+
+def encode_json(data: Any) -> bytes:
+    """
+    Encode a value as a newline terminated JSON document, using orjson
+    when it is available and the ledger-aware standard library encoder
+    otherwise. Values orjson cannot represent as the standard library
+    encoder does (integers wider than 64 bits, NaN or infinite floats,
+    which orjson writes as null, and dictionaries with keys that are not
+    strings) are left to the latter. Dataclasses are passed to the same
+    default as with the standard library encoder, so that both accept
+    the same values.
+    """
+    if HAS_ORJSON:
+        try:
+            encoded = orjson.dumps(
+                data,
+                default=_encode_default,
+                option=orjson.OPT_PASSTHROUGH_DATETIME
+                | orjson.OPT_PASSTHROUGH_DATACLASS
+                | orjson.OPT_APPEND_NEWLINE,
+            )
+        except orjson.JSONEncodeError:
+            pass
+        else:
+            # A non-finite float can only have been written as null, so
+            # the value is only inspected when the output has one.
+            if b"null" not in encoded or not _has_non_finite_float(data):
+                return encoded
+
+    return (DEFAULT_ENCODER.encode(data) + "\n").encode("utf-8")
+
+
+def decode_json(data: Union[str, bytes]) -> Any:
+    """
+    Decode a JSON document, using orjson when it is available and the
+    standard library decoder otherwise.
+    """
+    if HAS_ORJSON:
+        return orjson.loads(data)
+
+    return json.loads(data)
 
 
 def json_response(
@@ -43,14 +134,25 @@ def json_response(
     reason: Optional[str] = None,
     headers: Optional[LooseHeaders] = None,
 ) -> web.Response:
+    if data is not sentinel:
+        if text or body:
+            raise ValueError("only one of data, text, or body should be specified")
+
+        return web.Response(
+            body=encode_json(data),
+            status=status,
+            reason=reason,
+            headers=headers,
+            content_type="application/json",
+            charset="utf-8",
+        )
+
     return web.json_response(
-        data=data,
         text=text,  # type: ignore
         body=body,  # type: ignore
         status=status,
         reason=reason,
         headers=headers,  # type: ignore
-        dumps=lambda obj: DEFAULT_ENCODER.encode(obj) + "\n",
     )
 
 
@@ -64,26 +166,41 @@ def blob_success_response(
     return web.HTTPOk(body=body, content_type=content_type)
 
 
+@lru_cache(maxsize=256)
+def _error_body(code: str, description: str) -> str:
+    # Error responses are drawn from a small, mostly fixed set of
+    # (code, description) pairs, so their bodies are memoized. The shape
+    # is fixed, so the body is formatted in one pass rather than
+    # encoding a dict and appending the trailing newline.
+    return f'{{"code": {json.dumps(code)}, "description": {json.dumps(description)}}}\n'
+
+
+_ErrorResponse = TypeVar("_ErrorResponse", bound=web.HTTPException)
+
+
+def _error_response(
+    response_class: Type[_ErrorResponse], code: str, description: str
+) -> _ErrorResponse:
+    return response_class(
+        text=_error_body(code, description), content_type="application/json"
+    )
+
+
 def unauthorized_response(code: str, description: str) -> web.HTTPUnauthorized:
-    body = DEFAULT_ENCODER.encode({"code": code, "description": description}) + "\n"
-    return web.HTTPUnauthorized(text=body, content_type="application/json")
+    return _error_response(web.HTTPUnauthorized, code, description)
 
 
 def forbidden_response(code: str, description: str) -> web.HTTPForbidden:
-    body = DEFAULT_ENCODER.encode({"code": code, "description": description}) + "\n"
-    return web.HTTPForbidden(text=body, content_type="application/json")
+    return _error_response(web.HTTPForbidden, code, description)
 
 
 def not_found_response(code: str, description: str) -> web.HTTPNotFound:
-    body = DEFAULT_ENCODER.encode({"code": code, "description": description}) + "\n"
-    return web.HTTPNotFound(text=body, content_type="application/json")
+    return _error_response(web.HTTPNotFound, code, description)
 
 
 def bad_request(code: str, description: str) -> web.HTTPBadRequest:
-    body = DEFAULT_ENCODER.encode({"code": code, "description": description}) + "\n"
-    return web.HTTPBadRequest(text=body, content_type="application/json")
+    return _error_response(web.HTTPBadRequest, code, description)
 
 
 def internal_server_error(code: str, description: str) -> web.HTTPInternalServerError:
-    body = DEFAULT_ENCODER.encode({"code": code, "description": description}) + "\n"
-    return web.HTTPInternalServerError(text=body, content_type="application/json")
+    return _error_response(web.HTTPInternalServerError, code, description)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Optional
+from typing import Collection, Iterator, Optional, Set
 
 from aiohttp.web import Request
 
@@ -32,7 +32,9 @@ def get_configured_integration_ledger_claims(
 
     if claimed_ledger_id != config.ledger_id:
         LOG.debug(
-            f"Ledger ID mismatch in claims: {claimed_ledger_id} != {config.ledger_id}"
+            "Ledger ID mismatch in claims: %s != %s",
+            claimed_ledger_id,
+            config.ledger_id,
         )
         return None
 
@@ -68,6 +70,32 @@ def get_request_claims(request: Request):
     return request.get(DABL_JWT_LEDGER_CLAIMS, None)
 
 
+def claimed_parties(ledger_claims: JWTClaims) -> Iterator[str]:
+    """
+    Yield each distinct party that appears in both the 'readAs' and
+    'actAs' sections of the given ledger claims. Tokens usually carry
+    only a handful of parties, so this scans the shorter list against
+    the longer one rather than intersecting sets of both.
+    """
+    read_as_parties = ledger_claims.get("readAs") or ()
+    act_as_parties = ledger_claims.get("actAs") or ()
+
+    if len(read_as_parties) <= len(act_as_parties):
+        small, big = read_as_parties, act_as_parties
+    else:
+        small, big = act_as_parties, read_as_parties
+
+    # Membership is tested against a set once the longer list is long
+    # enough to pay for building one.
+    big_parties = set(big) if len(big) > 4 else big  # type: Collection[str]
+
+    seen = set()  # type: Set[str]
+    for party in small:
+        if party in big_parties and party not in seen:
+            seen.add(party)
+            yield party
+
+
 def get_request_parties(request: Request):
     """
     Get the DAML ledger parties identified in the current request's JWT
@@ -81,10 +109,7 @@ def get_request_parties(request: Request):
     if ledger_claims is None:
         return []
 
-    read_as_parties = ledger_claims.get("readAs", [])
-    act_as_parties = ledger_claims.get("actAs", [])
-
-    return list(set(read_as_parties).intersection(set(act_as_parties)))
+    return list(claimed_parties(ledger_claims))
 
 
 def get_single_request_party(request: Request):
@@ -96,12 +121,14 @@ def get_single_request_party(request: Request):
     returns None. If there are multiple such parties identified in the JWT,
     it is an error, and an exception is raised.
     """
-    parties = get_request_parties(request) or []
+    ledger_claims = get_request_claims(request)
+
+    if ledger_claims is None:
+        return None
+
+    parties = list(claimed_parties(ledger_claims))
 
-    if parties:
-        if len(parties) == 1:
-            return parties[0]
-        else:
-            raise Exception(f"Only one ledger party expected in token: {parties}")
+    if len(parties) > 1:
+        raise Exception(f"Only one ledger party expected in token: {parties}")
 
-    return None
+    return parties[0] if parties else None
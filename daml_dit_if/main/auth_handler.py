@@ -1,9 +1,21 @@
 from __future__ import annotations
 
-from typing import Awaitable, Callable, Optional
+import logging
+from dataclasses import dataclass
+from functools import wraps
+from typing import Awaitable, Callable, Iterable, Optional
+from weakref import WeakKeyDictionary
 
-from aiohttp.web import Application, Request, StreamResponse
-from aiohttp.web_middlewares import middleware
+from aiohttp.web import (
+    AbstractRoute,
+    AbstractRouteDef,
+    Application,
+    Request,
+    RouteDef,
+    StreamResponse,
+    middleware,
+    route,
+)
 from jwcrypto.common import JWException
 
 from ..api import AuthorizationLevel
@@ -14,7 +26,7 @@ from .auth_accessors import (
     is_integration_party_ledger_claim,
 )
 from .config import Configuration
-from .jwt import JWTValidator
+from .jwt import JWTClaims, JWTValidator, TokenCache
 from .log import LOG
 
 Handler = Callable[[Request], Awaitable[StreamResponse]]
@@ -22,39 +34,115 @@ Handler = Callable[[Request], Awaitable[StreamResponse]]
 
 DABL_AUTH_LEVEL = "__dabl_auth_level__"
 
+# Authorization levels are also tracked in a side table keyed by
+# handler, so that the per-request lookup is a single dictionary probe
+# rather than an attribute lookup with fallback.
+_AUTH_LEVELS = (
+    WeakKeyDictionary()
+)  # type: WeakKeyDictionary[Handler, AuthorizationLevel]
+
+# The level each route registered through AuthHandler.add_routes is
+# served at. A route's level takes precedence over its handler's, since
+# the same handler may be bound at more than one level.
+_ROUTE_AUTH_LEVELS = (
+    WeakKeyDictionary()
+)  # type: WeakKeyDictionary[AbstractRoute, AuthorizationLevel]
+
 
 def set_handler_auth(fn: Handler, auth: AuthorizationLevel) -> Handler:
     """
     Mark a request handler as not requiring authentication.
     """
     setattr(fn, DABL_AUTH_LEVEL, auth)
+    _AUTH_LEVELS[fn] = auth
 
     return fn
 
 
 def auth_level(auth: AuthorizationLevel) -> Callable[[Handler], Handler]:
-    def set(fn: "Handler") -> "Handler":
-        return set_handler_auth(fn, auth)
+    return lambda fn: set_handler_auth(fn, auth)
 
-    return set
+
+def get_auth_level(fn: Handler) -> AuthorizationLevel:
+    """
+    Return the authorization level a handler is marked with. Handlers
+    wrapped in a decorator are not in the side table themselves, but
+    carry the level of the handler they wrap as an attribute copied by
+    functools.wraps.
+    """
+    auth = _AUTH_LEVELS.get(fn)
+    if auth is None:
+        auth = getattr(fn, DABL_AUTH_LEVEL, AuthorizationLevel.PUBLIC)
+
+    return auth
 
 
 def get_handler_auth_level(request: Request) -> AuthorizationLevel:
-    return getattr(
-        request.match_info.handler, DABL_AUTH_LEVEL, AuthorizationLevel.PUBLIC
+    match_info = request.match_info
+
+    auth = _ROUTE_AUTH_LEVELS.get(match_info.route)
+    if auth is None:
+        auth = get_auth_level(match_info.handler)
+
+    return auth
+
+
+def _middleware_auth_level(route: AbstractRoute) -> AuthorizationLevel:
+    """
+    Return the level the authorization middleware enforces for a route.
+    Routes added through AuthHandler.add_routes carry their own check,
+    so the middleware treats them as public.
+    """
+    if route in _ROUTE_AUTH_LEVELS:
+        return AuthorizationLevel.PUBLIC
+
+    return get_auth_level(route.handler)
+
+
+@dataclass(frozen=True)
+class TokenAuthorization:
+    """
+    The outcome of validating a token against the integration's
+    configuration, cached per token to avoid repeating signature
+    verification and claim inspection on every request.
+    """
+
+    ledger_claims: Optional[JWTClaims]
+    integration_party: bool
+
+
+def _validate_integration_token(
+    config: Configuration, claims: JWTClaims
+) -> TokenAuthorization:
+    """
+    Extract the ledger claims of a verified token if they are for the
+    configured ledger ID, and note whether they claim the integration
+    party.
+    """
+    ledger_claims = get_configured_integration_ledger_claims(config, claims)
+
+    return TokenAuthorization(
+        ledger_claims=ledger_claims,
+        integration_party=ledger_claims is not None
+        and is_integration_party_ledger_claim(config, ledger_claims),
     )
 
 
+_BEARER_PREFIX = "Bearer "
+
+
 def _unvalidated_get_token(request: Request) -> Optional[str]:
     header_identity = request.headers.get("Authorization")  # type: Optional[str]
     if header_identity is not None:
-        scheme, _, bearer_token = header_identity.partition(" ")
-        if scheme != "Bearer" or not bearer_token or len(bearer_token) == 0:
-            raise unauthorized_response(
-                "invalid_auth_scheme",
-                "Invalid authorization scheme. Should be `Bearer <token>`",
-            )
-        return bearer_token
+        if header_identity.startswith(_BEARER_PREFIX):
+            bearer_token = header_identity[len(_BEARER_PREFIX) :]
+            if bearer_token:
+                return bearer_token
+
+        raise unauthorized_response(
+            "invalid_auth_scheme",
+            "Invalid authorization scheme. Should be `Bearer <token>`",
+        )
     else:
         # we also accept token as a query string for GET requests because it's the only way we
         # can get token information via redirects
@@ -69,29 +157,139 @@ class AuthHandler:
         self.config = config
         self.jwt_decoder = jwt_decoder
 
+        # Verified tokens are cached unless the cache is sized to zero.
+        self.token_cache = (
+            TokenCache(maxsize=config.token_cache_size)
+            if config.token_cache_size > 0
+            else None
+        )
+
     async def setup(self, app: Application) -> None:
-        app.middlewares.append(self.auth_middleware)
+        """
+        Arrange for routes registered directly on the application,
+        rather than through :meth:`add_routes`, to be authorized
+        according to their handler's level, so that they still fail
+        closed. The routes are checked once the application starts, and
+        the authorization middleware is only installed if one of them
+        needs it. Otherwise aiohttp has no middleware chain to build for
+        each request.
+        """
+        app.on_startup.append(self._install_middleware)
+
+    async def _install_middleware(self, app: Application) -> None:
+        unchecked = [
+            route
+            for route in app.router.routes()
+            if _middleware_auth_level(route) is not AuthorizationLevel.PUBLIC
+        ]
+
+        if unchecked:
+            LOG.info(
+                "Installing authorization middleware for %r route(s) added"
+                " outside AuthHandler.add_routes",
+                len(unchecked),
+            )
+            app.middlewares.append(self.auth_middleware)
 
     @middleware
-    async def auth_middleware(self, request: Request, handler):
-        LOG.debug("in auth middleware for request %s", request)
+    async def auth_middleware(self, request: Request, handler: Handler):
+        auth_level = _middleware_auth_level(request.match_info.route)
 
-        auth_level = get_handler_auth_level(request)
+        if auth_level is not AuthorizationLevel.PUBLIC:
+            await self.authorize(request, auth_level)
 
-        if auth_level != AuthorizationLevel.PUBLIC:
-            if self.jwt_decoder is None:
-                raise unauthorized_response(
-                    "no_authorization_support",
-                    "this endpoint requires authorization, which is unavailable without JWKS support.",
-                )
+        return await handler(request)
 
-            token = _unvalidated_get_token(request)
-            if token is None:
-                raise unauthorized_response(
-                    "missing_token",
-                    "this endpoint requires a valid token and none was supplied",
-                )
+    def add_routes(
+        self,
+        app: Application,
+        routes: Iterable[AbstractRouteDef],
+        auth: Optional[AuthorizationLevel] = None,
+    ) -> None:
+        """
+        Add routes to the application, wrapping each handler that
+        requires authorization with the appropriate check. Public
+        handlers are registered as they are, so they incur no
+        authorization overhead at all. If given, ``auth`` overrides the
+        level of every handler added.
+        """
+        for route_def in routes:
+            if not isinstance(route_def, RouteDef):
+                app.add_routes([route_def])
+                continue
+
+            handler = route_def.handler
+            handler_auth = get_auth_level(handler) if auth is None else auth
+
+            [added] = app.add_routes(
+                [
+                    route(
+                        route_def.method,
+                        route_def.path,
+                        self.wrap_handler(handler, handler_auth),
+                        **route_def.kwargs,
+                    )
+                ]
+            )
+
+            # GET routes come with an implicit HEAD route on the same
+            # resource and handler, which is served at the same level.
+            for resource_route in added.resource or (added,):
+                if resource_route.handler is added.handler:
+                    _ROUTE_AUTH_LEVELS[resource_route] = handler_auth
+
+    def wrap_handler(
+        self, handler: Handler, auth_level: Optional[AuthorizationLevel] = None
+    ) -> Handler:
+        if auth_level is None:
+            auth_level = get_auth_level(handler)
+
+        if auth_level is AuthorizationLevel.PUBLIC:
+            return handler
+
+        authorize = self.authorize
+
+        @wraps(handler)
+        async def authorized(request: Request) -> StreamResponse:
+            await authorize(request, auth_level)
+
+            if LOG.isEnabledFor(logging.DEBUG):
+                LOG.debug("Passing control to handler...: (%s)", handler)
+
+            return await handler(request)
+
+        return set_handler_auth(authorized, auth_level)
+
+    async def authorize(self, request: Request, auth_level: AuthorizationLevel) -> None:
+        """
+        Validate the request's token against the given authorization
+        level, raising an HTTP error response if it is insufficient. On
+        success, the token's ledger claims are stored on the request.
+        """
+        if LOG.isEnabledFor(logging.DEBUG):
+            LOG.debug("Authorizing request %s", request)
+
+        if self.jwt_decoder is None:
+            raise unauthorized_response(
+                "no_authorization_support",
+                "this endpoint requires authorization, which is unavailable without JWKS support.",
+            )
+
+        token = _unvalidated_get_token(request)
+        if token is None:
+            raise unauthorized_response(
+                "missing_token",
+                "this endpoint requires a valid token and none was supplied",
+            )
+
+        token_cache = self.token_cache
+        authorization = None
 
+        if token_cache is not None:
+            cache_key = token_cache.key(token)
+            authorization = token_cache.get(cache_key)
+
+        if authorization is None:
             try:
                 claims = await self.jwt_decoder.decode_claims(token)
             except JWException as ex:
@@ -100,27 +298,27 @@ class AuthHandler:
                     "invalid_token", "this endpoint was presented with an invalid token"
                 )
 
-            ledger_claims = get_configured_integration_ledger_claims(
-                self.config, claims
-            )
+            authorization = _validate_integration_token(self.config, claims)
 
-            if ledger_claims is None:
-                raise unauthorized_response(
-                    "missing_ledger_claims",
-                    "this endpoint requires a valid token containing DAML ledger API claims"
-                    f' for ledger ID "{self.config.ledger_id}"',
-                )
+            if token_cache is not None:
+                token_cache.put(cache_key, authorization, claims.get("exp"))
 
-            if (
-                auth_level == AuthorizationLevel.INTEGRATION_PARTY
-                and not is_integration_party_ledger_claim(self.config, ledger_claims)
-            ):
-                raise unauthorized_response(
-                    "unauthorized",
-                    "unauthorized token",
-                )
+        ledger_claims = authorization.ledger_claims
+
+        if ledger_claims is None:
+            raise unauthorized_response(
+                "missing_ledger_claims",
+                "this endpoint requires a valid token containing DAML ledger API claims"
+                f' for ledger ID "{self.config.ledger_id}"',
+            )
 
-            request[DABL_JWT_LEDGER_CLAIMS] = ledger_claims
+        if (
+            auth_level is AuthorizationLevel.INTEGRATION_PARTY
+            and not authorization.integration_party
+        ):
+            raise unauthorized_response(
+                "unauthorized",
+                "unauthorized token",
+            )
 
-        LOG.debug("Passing control to handler...: (%r)", handler)
-        return await handler(request)
+        request[DABL_JWT_LEDGER_CLAIMS] = ledger_claims
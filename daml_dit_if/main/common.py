@@ -1,11 +1,11 @@
 from __future__ import annotations
 
-import collections
-import sys
+import logging
 from asyncio import wait_for
+from collections.abc import Sequence
 from dataclasses import dataclass
 from datetime import datetime
-from functools import wraps
+from functools import update_wrapper, wraps
 from typing import Optional
 
 from dazl import AIOPartyClient
@@ -24,6 +24,16 @@ class IntegrationQueueStatus:
 
 @dataclass
 class InvocationStatus:
+    __slots__ = (
+        "index",
+        "label",
+        "command_count",
+        "use_count",
+        "error_count",
+        "error_message",
+        "error_time",
+    )
+
     index: int
     label: Optional[str]
     command_count: int
@@ -50,34 +60,61 @@ def with_marshalling(mfn, fn):
 
 
 def normalize_integration_response(response):
-    LOG.debug("Normalizing integration response: %r", response)
+    debug = LOG.isEnabledFor(logging.DEBUG)
+    if debug:
+        LOG.debug("Normalizing integration response: %r", response)
 
     if isinstance(response, IntegrationResponse):
-        LOG.debug("Integration Response passthrough")
+        if debug:
+            LOG.debug("Integration Response passthrough")
         return response
 
-    commands = []
-    if isinstance(response, collections.Sequence):
+    # Concrete type checks come first, since they are far cheaper than
+    # the ABC check that also admits other sequence types.
+    response_type = type(response)
+    if response_type is list or response_type is tuple:
+        commands = response
+    elif isinstance(response, Sequence):
         commands = response
     elif response:
         commands = [response]
     else:
         commands = []
 
-    LOG.debug("Integration response with ledger commands: %r", commands)
+    if debug:
+        LOG.debug("Integration response with ledger commands: %r", commands)
 
     return IntegrationResponse(commands=commands)
 
 
-def as_handler_invocation(client: AIOPartyClient, inv_status: InvocationStatus, fn):
-    @wraps(fn)
-    async def wrapped(*args, **kwargs):
+class HandlerInvocation:
+    """
+    Invokes an integration handler, submits any ledger commands in its
+    response, and records the outcome in the handler's invocation
+    status.
+    """
+
+    # The instance dict holds the handler's name, docstring and other
+    # metadata, copied over as functools.wraps would, so that functions
+    # decorated by an integration keep them.
+    __slots__ = ("client", "inv_status", "fn", "__dict__")
+
+    def __init__(self, client: AIOPartyClient, inv_status: InvocationStatus, fn):
+        self.client = client
+        self.inv_status = inv_status
+        self.fn = fn
+
+        update_wrapper(self, fn)
+
+    async def __call__(self, *args, **kwargs):
+        inv_status = self.inv_status
+
         LOG.debug("Invoking for invocation status: %r", inv_status)
         inv_status.use_count += 1
 
         response = None
         try:
-            response = normalize_integration_response(await fn(*args, **kwargs))
+            response = normalize_integration_response(await self.fn(*args, **kwargs))
             exception = None
 
             if response.commands:
@@ -90,7 +127,7 @@ def as_handler_invocation(client: AIOPartyClient, inv_status: InvocationStatus,
                 inv_status.command_count += len(response.commands)
                 try:
                     await wait_for(
-                        client.submit(response.commands), response.command_timeout
+                        self.client.submit(response.commands), response.command_timeout
                     )
                 except Exception as e:
                     exception = e
@@ -104,10 +141,14 @@ def as_handler_invocation(client: AIOPartyClient, inv_status: InvocationStatus,
 
             return response
 
-        except Exception:
+        except Exception as ex:
             inv_status.error_count += 1
-            inv_status.error_message = repr(sys.exc_info()[1])
+            inv_status.error_message = repr(ex)
             inv_status.error_time = datetime.utcnow()
-            LOG.exception("Error while processing: " + inv_status.error_message)
+            LOG.exception("Error while processing: %s", inv_status.error_message)
 
-    return wrapped
+
+def as_handler_invocation(
+    client: AIOPartyClient, inv_status: InvocationStatus, fn
+) -> HandlerInvocation:
+    return HandlerInvocation(client, inv_status, fn)
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+import logging
 import os
 from dataclasses import asdict, dataclass
-from typing import Optional
+from typing import Any, Callable, Optional, Tuple
 
 from daml_dit_api import DABL_META_NAME
 
@@ -21,6 +22,11 @@ class Configuration:
     log_level: int
     jwks_url: "Optional[str]"
     queue_size: int
+    queue_batch_size: int
+    queue_batch_timeout_ms: int
+    queue_concurrency: int
+    token_cache_size: int
+    recursion_limit: int
 
 
 def optenv(var: str) -> Optional[str]:
@@ -31,46 +37,54 @@ def optenv(var: str) -> Optional[str]:
     return val
 
 
-def env(var: str, default: Optional[str] = None) -> str:
+# Configuration fields with a default, the environment variables they
+# are read from, their defaults, and the conversion applied to values
+# that are set.
+_ENV_SPEC = (
+    ("health_port", "DABL_HEALTH_PORT", 8089, int),
+    ("ledger_url", "DABL_LEDGER_URL", "http://localhost:6865", str),
+    ("ledger_id", "DABL_LEDGER_ID", "cloudbox", str),
+    ("dit_meta_path", "DAML_DIT_META_PATH", DABL_META_NAME, str),
+    ("integration_spec_path", "DABL_INTEGRATION_METADATA_PATH", "int_args.yaml", str),
+    ("log_level", "DABL_LOG_LEVEL", 0, int),
+    ("queue_size", "DABL_QUEUE_SIZE", 512, int),
+    ("queue_batch_size", "DABL_QUEUE_BATCH_SIZE", 1, int),
+    ("queue_batch_timeout_ms", "DABL_QUEUE_BATCH_TIMEOUT_MS", 10, int),
+    ("queue_concurrency", "DABL_QUEUE_CONCURRENCY", 1, int),
+    ("token_cache_size", "DABL_TOKEN_CACHE_SIZE", 10000, int),
+    ("recursion_limit", "DABL_RECURSION_LIMIT", 10000, int),
+)  # type: Tuple[Tuple[str, str, Any, Callable[[str], Any]], ...]
+
+# Optional configuration fields and the environment variables they are
+# taken from verbatim.
+_OPTIONAL_ENV_SPEC = (
+    ("type_id", "DABL_INTEGRATION_TYPE_ID"),
+    ("run_as_party", "DAML_LEDGER_PARTY"),
+    ("jwks_url", "DABL_JWKS_URL"),
+)  # type: Tuple[Tuple[str, str], ...]
+
+
+def _env_value(var: str, default: Any, conv: Callable[[str], Any]) -> Any:
     val = optenv(var)
 
-    if val:
-        return val
-    elif default is not None:
-        LOG.debug(
-            "Using default %r for unspecified configuration environment variable: %r",
-            default,
-            var,
-        )
+    if not val:
         return default
-    else:
-        FAIL(f"Missing required environment variable: {var}")
-        return ""  # unreached
-
-
-def envint(var: str, default: Optional[int] = None) -> int:
-    val = env(var, None if default is None else str(default))
 
     try:
-        return int(val)
+        return conv(val)
     except ValueError:
-        FAIL(f"Invalid integer {val} in environment variable: {var}")
+        FAIL(f"Invalid {conv.__name__} {val} in environment variable: {var}")
 
 
 def get_default_config() -> Configuration:
-    config = Configuration(
-        health_port=envint("DABL_HEALTH_PORT", 8089),
-        ledger_url=env("DABL_LEDGER_URL", "http://localhost:6865"),
-        ledger_id=env("DABL_LEDGER_ID", "cloudbox"),
-        dit_meta_path=env("DAML_DIT_META_PATH", DABL_META_NAME),
-        integration_spec_path=env("DABL_INTEGRATION_METADATA_PATH", "int_args.yaml"),
-        type_id=optenv("DABL_INTEGRATION_TYPE_ID"),
-        run_as_party=optenv("DAML_LEDGER_PARTY"),
-        log_level=envint("DABL_LOG_LEVEL", 0),
-        jwks_url=optenv("DABL_JWKS_URL"),
-        queue_size=envint("DABL_QUEUE_SIZE", 512),
-    )
-
-    LOG.info("Configuration: %r", asdict(config))
+    values = {
+        name: _env_value(var, default, conv) for (name, var, default, conv) in _ENV_SPEC
+    }
+    values.update((name, optenv(var)) for (name, var) in _OPTIONAL_ENV_SPEC)
+
+    config = Configuration(**values)
+
+    if LOG.isEnabledFor(logging.INFO):
+        LOG.info("Configuration: %r", asdict(config))
 
     return config
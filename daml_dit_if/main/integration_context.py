@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 import asyncio
-import sys
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 from importlib import import_module
 from typing import Any, Optional, Sequence, Type
 
@@ -57,12 +57,17 @@ def normalize_metadata_field(field_value, field_type_info):
     return field_value.strip()
 
 
-def normalize_metadata(metadata, integration_type):
+def get_field_types(integration_type):
+    return {field.id: field for field in integration_type.fields}
+
+
+def normalize_metadata(metadata, integration_type, field_types=None):
     LOG.debug(
         "Normalizing metadata %r for integration type: %r", metadata, integration_type
     )
 
-    field_types = {field.id: field for field in integration_type.fields}
+    if field_types is None:
+        field_types = get_field_types(integration_type)
 
     return {
         field_id: normalize_metadata_field(field_value, field_types.get(field_id))
@@ -74,6 +79,7 @@ def _as_int(value: Any) -> int:
     return int(value)
 
 
+@lru_cache(maxsize=128)
 def parse_qualified_symbol(symbol_text: str):
     try:
         (module_name, sym_name) = symbol_text.split(":")
@@ -110,8 +116,10 @@ class IntegrationContext:
 
         self.type_id = type_id
         self.network = network
+        self.config = config
         self.run_as_party = config.run_as_party
         self.integration_type = integration_type
+        self.field_types = get_field_types(integration_type)
         self.integration_spec = integration_spec
         self.metadata = metadata
 
@@ -180,11 +188,18 @@ class IntegrationContext:
         env_class = self.get_integration_env_class(self.integration_type)
         entry_fn = self.get_integration_entrypoint(self.integration_type)
 
-        metadata = normalize_metadata(metadata, self.integration_type)
+        metadata = normalize_metadata(
+            metadata, self.integration_type, field_types=self.field_types
+        )
 
         LOG.info("Starting integration with metadata: %r", metadata)
 
-        self.queue_context = IntegrationQueueContext(self.queue, client)
+        self.queue_context = IntegrationQueueContext(
+            self.queue,
+            client,
+            batch_size=self.config.queue_batch_size,
+            batch_timeout=self.config.queue_batch_timeout_ms / 1000,
+        )
         self.time_context = IntegrationTimeContext(self.queue, client)
         self.ledger_context = IntegrationLedgerContext(
             self.queue, client, self.metadata.daml_model
@@ -255,10 +270,8 @@ class IntegrationContext:
     async def safe_load(self):
         try:
             await self._load()
-        except:  # noqa
-            ex = sys.exc_info()[1]
-
-            self.error_message = f"{repr(ex)} - {str(ex)}"
+        except Exception as ex:
+            self.error_message = f"{ex!r}"
             self.error_time = datetime.utcnow()
 
             LOG.exception("Failure loading integration.")
@@ -266,10 +279,8 @@ class IntegrationContext:
     async def safe_start(self):
         try:
             await self._start()
-        except:  # noqa
-            ex = sys.exc_info()[1]
-
-            self.error_message = f"{repr(ex)} - {str(ex)}"
+        except Exception as ex:
+            self.error_message = f"{ex!r}"
             self.error_time = datetime.utcnow()
 
             LOG.exception("Failure starting integration.")
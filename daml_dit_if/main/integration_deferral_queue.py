@@ -1,62 +1,210 @@
 from __future__ import annotations
 
 import asyncio
-from dataclasses import dataclass
-from typing import Callable
+import logging
+from collections import deque
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Hashable,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
 
 from .common import IntegrationQueueStatus, InvocationStatus
 from .config import Configuration
 from .log import LOG
 
-DeferredAction = Callable[[], None]
+DeferredAction = Callable[..., Awaitable[None]]
 
+# Number of queued entries the worker runs back to back before yielding
+# to the event loop, so that a long backlog of actions that complete
+# without suspending cannot starve other tasks.
+DRAIN_YIELD_INTERVAL = 32
 
-@dataclass
-class IntegrationQueueAction:
+
+class IntegrationQueueAction(NamedTuple):
     action: DeferredAction
+    args: Tuple[Any, ...]
     status: InvocationStatus
+    events: int = 1
 
 
 class IntegrationDeferralQueue:
+    """
+    Queue of deferred handler invocations. Actions are awaited directly
+    by the consumer coroutines rather than spawned as tasks, so every
+    action runs in the consumer's context and handlers cannot rely on
+    per-task context variables.
+
+    Entries are run one at a time, in the order they were queued. With a
+    concurrency above one, entries put with a key are instead ordered
+    only against other entries with the same key, and are run by that
+    many additional consumers alongside the unkeyed entries.
+    """
+
     def __init__(self, config: Configuration):
         self.total_events = 0
         self.skipped_events = 0
         self.queue_size = config.queue_size
-
-        self.queue = asyncio.Queue(
-            maxsize=self.queue_size
-        )  # type: asyncio.Queue[IntegrationQueueAction]
-
-    async def put(self, action: DeferredAction, status: InvocationStatus):
+        self.pending_events = 0
+        self.concurrency = max(1, config.queue_concurrency)
+
+        # The consumers all run on the event loop thread, so a plain
+        # deque and a wakeup event stand in for an asyncio.Queue.
+        self.entries = deque()  # type: Deque[IntegrationQueueAction]
+        self.not_empty = asyncio.Event()
+
+        # Each key has its own sub-queue. A key is in ``ready`` only while
+        # it has entries and none of them is running, so a burst of
+        # entries for one key never holds up a consumer that could be
+        # running another key's entries.
+        self.keyed = {}  # type: Dict[Hashable, Deque[IntegrationQueueAction]]
+        self.ready = deque()  # type: Deque[Hashable]
+        self.ready_not_empty = asyncio.Event()
+
+    async def put(
+        self,
+        action: DeferredAction,
+        status: InvocationStatus,
+        *args: Any,
+        key: Optional[Hashable] = None,
+    ):
+        self.put_nowait(action, status, *args, key=key)
+
+    def put_nowait(
+        self,
+        action: DeferredAction,
+        status: InvocationStatus,
+        *args: Any,
+        key: Optional[Hashable] = None,
+    ):
+        self.reserve_nowait(status)
+        self.put_reserved_nowait(action, status, 1, *args, key=key)
+
+    def reserve_nowait(self, status: InvocationStatus):
+        """
+        Count one event against the capacity of the queue, ahead of
+        putting it with put_reserved_nowait. Raises QueueFull, as
+        put_nowait does, if the queue is full.
+        """
         self.total_events = self.total_events + 1
 
-        try:
-            self.queue.put_nowait(IntegrationQueueAction(action=action, status=status))
-
-        except asyncio.QueueFull:
+        if 0 < self.queue_size <= self.pending_events:
             self.skipped_events = self.skipped_events + 1
             LOG.error("Work queue overrun, skipping event: %r", status)
-            raise
+            raise asyncio.QueueFull()
+
+        self.pending_events = self.pending_events + 1
+
+    def put_reserved_nowait(
+        self,
+        action: DeferredAction,
+        status: InvocationStatus,
+        events: int,
+        *args: Any,
+        key: Optional[Hashable] = None,
+    ):
+        """
+        Put a single entry that stands for ``events`` events which have
+        already been reserved. This never fails for lack of capacity.
+        """
+        entry = IntegrationQueueAction(action, args, status, events)
+
+        if key is None or self.concurrency == 1:
+            self.entries.append(entry)
+            self.not_empty.set()
+            return
+
+        keyed_entries = self.keyed.get(key)
+        if keyed_entries is None:
+            keyed_entries = self.keyed[key] = deque()
+            self.ready.append(key)
+            self.ready_not_empty.set()
+
+        keyed_entries.append(entry)
 
     def get_status(self) -> IntegrationQueueStatus:
         return IntegrationQueueStatus(
             total_events=self.total_events,
-            pending_events=self.queue.qsize(),
+            pending_events=self.pending_events,
             skipped_events=self.skipped_events,
             queue_size=self.queue_size,
         )
 
     async def start(self):
-        LOG.info("Queue worker starting.")
+        LOG.info("Queue worker starting (concurrency=%r).", self.concurrency)
+
+        if self.concurrency > 1:
+            await asyncio.gather(
+                self._consume(self.entries, self.not_empty, False),
+                *[
+                    self._consume(self.ready, self.ready_not_empty, True)
+                    for _ in range(self.concurrency)
+                ],
+            )
+        else:
+            await self._consume(self.entries, self.not_empty, False)
+
+    async def _consume(self, pending: Deque, not_empty: asyncio.Event, keyed: bool):
+        debug = LOG.isEnabledFor(logging.DEBUG)
+        drained = 0
 
         while True:
-            LOG.debug("Waiting for queue entry.")
+            # Work through everything that has been queued, including
+            # entries added while earlier ones are running, before
+            # waiting again.
+            if not pending:
+                if debug:
+                    LOG.debug("Waiting for queue entry.")
+
+                not_empty.clear()
+                await not_empty.wait()
+
+                # The log level can change at runtime, so this is checked
+                # once per wakeup and once per yield during a backlog,
+                # rather than once per entry or at import.
+                debug = LOG.isEnabledFor(logging.DEBUG)
+                drained = 0
+                continue
+
+            if drained and drained % DRAIN_YIELD_INTERVAL == 0:
+                await asyncio.sleep(0)
+
+                debug = LOG.isEnabledFor(logging.DEBUG)
+
+                if not pending:
+                    continue
+
+            drained += 1
+
+            if keyed:
+                # The key stays out of ``ready`` while its entry runs, which
+                # keeps its entries in order across consumers.
+                key = pending.popleft()
+                keyed_entries = self.keyed[key]
+                entry = keyed_entries.popleft()
+            else:
+                entry = pending.popleft()
+
+            self.pending_events = self.pending_events - entry.events
 
             try:
-                entry = await self.queue.get()
+                if debug:
+                    LOG.debug("Processing queue entry: %r", entry.status.label)
 
-                LOG.info("Processing queue entry: %r", entry.status.label)
-                await entry.action()
+                await entry.action(*entry.args)
 
-            except:  # noqa: E722
+            except Exception:
                 LOG.exception("Uncaught error in queue worker loop")
+
+            if keyed:
+                if keyed_entries:
+                    pending.append(key)
+                    not_empty.set()
+                else:
+                    del self.keyed[key]
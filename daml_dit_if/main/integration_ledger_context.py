@@ -1,12 +1,15 @@
 from __future__ import annotations
 
+import asyncio
+import logging
 from dataclasses import dataclass
+from functools import partial
 from typing import Any, Callable, List, Optional, Sequence, Tuple
 
 from daml_dit_api import DamlModelInfo
 from dazl import AIOPartyClient
 from dazl.model.core import ContractMatch
-from dazl.model.reading import ContractCreateEvent
+from dazl.model.reading import ContractArchiveEvent, ContractCreateEvent
 from dazl.model.writing import EventHandlerResponse
 
 from ..api import (
@@ -33,15 +36,31 @@ Sweep = Tuple[
 
 PendingHandlerCall = Callable[[], None]
 
+# Number of swept contracts handled back to back before yielding to the
+# event loop, to keep the web endpoint responsive during large sweeps.
+SWEEP_YIELD_INTERVAL = 32
+
 
 @dataclass
 class LedgerHandlerStatus(InvocationStatus):
+    __slots__ = ("template_id", "sweep_enabled", "flow_enabled")
+
     template_id: "Optional[str]"
     sweep_enabled: bool
     flow_enabled: bool
 
 
 class IntegrationLedgerContext(IntegrationLedgerEvents):
+    __slots__ = (
+        "queue",
+        "client",
+        "handlers",
+        "sweeps",
+        "init_handlers",
+        "ready_handlers",
+        "daml_model",
+    )
+
     def __init__(
         self,
         queue: IntegrationDeferralQueue,
@@ -89,17 +108,23 @@ class IntegrationLedgerContext(IntegrationLedgerEvents):
         for init_handler in self.init_handlers:
             await init_handler()
 
+        # Bound locally, since the inner loop runs once per active contract.
+        create_event = IntegrationLedgerContractCreateEvent
+        find_active = self.client.find_active
+
         for template, match, wfunc in self.sweeps:
             LOG.debug("Processing sweep for %r", template)
 
-            for cid, cdata in self.client.find_active(template, match).items():
-                LOG.debug("Sweep contract: %r => %r", cid, cdata)
+            debug = LOG.isEnabledFor(logging.DEBUG)
+
+            for count, (cid, cdata) in enumerate(find_active(template, match).items()):
+                if count and count % SWEEP_YIELD_INTERVAL == 0:
+                    await asyncio.sleep(0)
 
-                await wfunc(
-                    IntegrationLedgerContractCreateEvent(
-                        initial=True, cid=cid, cdata=cdata
-                    )
-                )
+                if debug:
+                    LOG.debug("Sweep contract: %r => %r", cid, cdata)
+
+                await wfunc(create_event(initial=True, cid=cid, cdata=cdata))
 
         LOG.debug("Sweeps processed, invoking ready handlers")
 
@@ -113,6 +138,23 @@ class IntegrationLedgerContext(IntegrationLedgerEvents):
             initial=False, cid=dazl_event.cid, cdata=dazl_event.cdata
         )
 
+    def _to_int_contract_event(self, dazl_event):
+        if isinstance(dazl_event, ContractArchiveEvent):
+            return IntegrationLedgerContractArchiveEvent(cid=dazl_event.cid)
+
+        return self._to_int_create_event(dazl_event)
+
+    def _to_int_transaction_event(self, event_class, dazl_event):
+        to_int_contract_event = self._to_int_contract_event
+
+        return event_class(
+            command_id=dazl_event.command_id,
+            workflow_id=dazl_event.workflow_id,
+            contract_events=[
+                to_int_contract_event(e) for e in dazl_event.contract_events
+            ],
+        )
+
     def ledger_init(self):
         handler_status = self._notice_handler("Ledger Init", None, False, True)
 
@@ -144,14 +186,9 @@ class IntegrationLedgerContext(IntegrationLedgerEvents):
     def transaction_start(self):
         handler_status = self._notice_handler("Transaction Start", None, False, True)
 
-        def to_int_event(dazl_event):
-            return IntegrationLedgerTransactionEndEvent(
-                command_id=dazl_event.command_id,
-                workflow_id=dazl_event.workflow_id,
-                contract_events=[
-                    self._to_int_create_event(e) for e in dazl_event.contract_events
-                ],
-            )
+        to_int_event = partial(
+            self._to_int_transaction_event, IntegrationLedgerTransactionStartEvent
+        )
 
         def wrap_method(func):
             handler = with_marshalling(
@@ -170,14 +207,9 @@ class IntegrationLedgerContext(IntegrationLedgerEvents):
     def transaction_end(self):
         handler_status = self._notice_handler("Transaction End", None, False, True)
 
-        def to_int_event(dazl_event):
-            return IntegrationLedgerTransactionEndEvent(
-                command_id=dazl_event.command_id,
-                workflow_id=dazl_event.workflow_id,
-                contract_events=[
-                    self._to_int_create_event(e) for e in dazl_event.contract_events
-                ],
-            )
+        to_int_event = partial(
+            self._to_int_transaction_event, IntegrationLedgerTransactionEndEvent
+        )
 
         def wrap_method(func):
             handler = with_marshalling(
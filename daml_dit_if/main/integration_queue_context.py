@@ -1,12 +1,14 @@
 from __future__ import annotations
 
-from typing import Any, Awaitable, Callable, Dict, Sequence, Tuple
+import asyncio
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, List, Sequence, Tuple
 
 from dazl import AIOPartyClient, Command
 
 from ..api import IntegrationQueueEvents, IntegrationQueueSink
 from .common import InvocationStatus, as_handler_invocation, without_return_value
-from .integration_deferral_queue import IntegrationDeferralQueue
+from .integration_deferral_queue import DeferredAction, IntegrationDeferralQueue
 from .log import LOG
 
 IntegrationQueueHandler = Callable[[Any], Awaitable[Sequence[Command]]]
@@ -15,30 +17,140 @@ IntegrationQueueDict = Dict[str, Tuple[IntegrationQueueHandler, InvocationStatus
 
 
 class IntegrationQueueSinkImpl(IntegrationQueueSink):
-    def __init__(self, queues: IntegrationQueueDict):
+    __slots__ = ("queues", "handlers", "deferral_queue")
+
+    def __init__(
+        self,
+        queues: IntegrationQueueDict,
+        handlers: Dict[str, DeferredAction],
+        deferral_queue: IntegrationDeferralQueue,
+    ):
         self.queues = queues
-
-    async def put(self, message: Any, queue_name: str = "default"):
-        LOG.debug("Queue put (%r): %r", queue_name, message)
-
-        if queue_name not in self.queues:
+        self.handlers = handlers
+        self.deferral_queue = deferral_queue
+
+    def _get_queue(
+        self, queue_name: str
+    ) -> Tuple[IntegrationQueueHandler, InvocationStatus]:
+        entry = self.queues.get(queue_name)
+        if entry is None:
             raise Exception(
                 f"Unknown queue: {queue_name} (valid: {list(self.queues.keys())}) "
             )
 
-        (handler, _) = self.queues[queue_name]
+        return entry
+
+    async def put(self, message: Any, queue_name: str = "default"):
+        LOG.debug("Queue put (%r): %r", queue_name, message)
+
+        (handler, _) = self._get_queue(queue_name)
 
         LOG.debug("Queue put handler: %r", handler)
 
         await handler(message)
 
+    def put_nowait(self, message: Any, queue_name: str = "default"):
+        LOG.debug("Queue put_nowait (%r): %r", queue_name, message)
+
+        (_, status) = self._get_queue(queue_name)
+
+        self.deferral_queue.put_nowait(
+            self.handlers[queue_name], status, message, key=queue_name
+        )
+
+
+async def _process_batch(handler: DeferredAction, batch: List[Any]):
+    for message in batch:
+        await handler(message)
+
+
+class BatchingQueueSink(IntegrationQueueSinkImpl):
+    """
+    Queue sink that coalesces messages put onto a queue in quick
+    succession into a single deferral queue entry. A batch is flushed
+    once it reaches ``batch_size`` messages, or ``batch_timeout``
+    seconds after its first message, whichever comes first. Messages
+    within a batch are handled in the order they were put.
+    """
+
+    __slots__ = ("batch_size", "batch_timeout", "pending", "timers")
+
+    def __init__(
+        self,
+        queues: IntegrationQueueDict,
+        handlers: Dict[str, DeferredAction],
+        deferral_queue: IntegrationDeferralQueue,
+        batch_size: int,
+        batch_timeout: float,
+    ):
+        super().__init__(queues, handlers, deferral_queue)
+        self.batch_size = batch_size
+        self.batch_timeout = batch_timeout
+
+        self.pending = {}  # type: Dict[str, List[Any]]
+        self.timers = {}  # type: Dict[str, asyncio.TimerHandle]
+
+    async def put(self, message: Any, queue_name: str = "default"):
+        self.put_nowait(message, queue_name)
+
+    def put_nowait(self, message: Any, queue_name: str = "default"):
+        (_, status) = self._get_queue(queue_name)
+
+        # Room for the message is taken when it is put, so a full queue
+        # is reported to the producer rather than dropping the batch
+        # when it is flushed.
+        self.deferral_queue.reserve_nowait(status)
+
+        batch = self.pending.setdefault(queue_name, [])
+        batch.append(message)
+
+        if len(batch) >= self.batch_size:
+            self._flush(queue_name)
+        elif queue_name not in self.timers:
+            self.timers[queue_name] = asyncio.get_running_loop().call_later(
+                self.batch_timeout, self._flush, queue_name
+            )
+
+    def _flush(self, queue_name: str):
+        timer = self.timers.pop(queue_name, None)
+        if timer is not None:
+            timer.cancel()
+
+        batch = self.pending.pop(queue_name, None)
+        if not batch:
+            return
+
+        handler = self.handlers[queue_name]
+        (_, status) = self.queues[queue_name]
+
+        LOG.debug("Flushing %r message(s) for queue %r", len(batch), queue_name)
+
+        self.deferral_queue.put_reserved_nowait(
+            _process_batch, status, len(batch), handler, batch, key=queue_name
+        )
+
 
 class IntegrationQueueContext(IntegrationQueueEvents):
-    def __init__(self, queue: IntegrationDeferralQueue, client: AIOPartyClient):
+    __slots__ = ("queue", "client", "queues", "handlers", "sink")
+
+    def __init__(
+        self,
+        queue: IntegrationDeferralQueue,
+        client: AIOPartyClient,
+        batch_size: int = 1,
+        batch_timeout: float = 0.01,
+    ):
         self.queue = queue
         self.client = client
         self.queues = {}  # type: IntegrationQueueDict
-        self.sink = IntegrationQueueSinkImpl(self.queues)
+        self.handlers = {}  # type: Dict[str, DeferredAction]
+
+        if batch_size > 1:
+            self.sink = BatchingQueueSink(
+                self.queues, self.handlers, queue, batch_size, batch_timeout
+            )  # type: IntegrationQueueSinkImpl
+        else:
+            self.sink = IntegrationQueueSinkImpl(self.queues, self.handlers, queue)
 
     def message(self, queue_name: str = "default"):
         def decorator(fn: "IntegrationQueueHandler"):
@@ -61,13 +173,14 @@ class IntegrationQueueContext(IntegrationQueueEvents):
 
             LOG.info("Registering handler for queue messages: %r", queue_name)
 
-            async def enqueue_wrapped(message):
-                async def doit():
-                    await wrapped(message)
-
-                await self.queue.put(doit, status)
+            # Calling this returns the queue's put coroutine directly,
+            # without an intermediate coroutine per enqueued message.
+            # Messages are keyed by queue, so different queues can be
+            # handled concurrently while each stays in order.
+            enqueue_wrapped = partial(self.queue.put, wrapped, status, key=queue_name)
 
             self.queues[queue_name] = (enqueue_wrapped, status)
+            self.handlers[queue_name] = wrapped
 
             return wrapped
 
@@ -1,13 +1,14 @@
 from __future__ import annotations
 
 import asyncio
+import heapq
 from typing import Callable, List, Optional, Sequence, Tuple
 
 from dazl import AIOPartyClient
 
 from ..api import IntegrationTimeEvents
 from .common import InvocationStatus, as_handler_invocation, without_return_value
-from .integration_deferral_queue import IntegrationDeferralQueue
+from .integration_deferral_queue import DeferredAction, IntegrationDeferralQueue
 from .log import LOG
 
 IntegrationTimerHandler = Callable[[], None]
@@ -17,9 +18,9 @@ class IntegrationTimeContext(IntegrationTimeEvents):
     def __init__(self, queue: IntegrationDeferralQueue, client: AIOPartyClient):
         self.queue = queue
         self.client = client
-        self.intervals = (
-            []
-        )  # type: List[Tuple[int, IntegrationTimerHandler,InvocationStatus]]
+        self.intervals = []  # type: List[Tuple[int, DeferredAction, InvocationStatus]]
+        self.statuses = []  # type: List[InvocationStatus]
+        self.task = None  # type: Optional[asyncio.Task[None]]
 
     def periodic_interval(self, seconds, label: Optional[str] = None):
         label_text = label or "Periodic Interval"
@@ -40,38 +41,71 @@ class IntegrationTimeContext(IntegrationTimeEvents):
             )
 
             self.intervals.append((seconds, wrapped, status))
+            self.statuses.append(status)
 
             return wrapped
 
         return decorator
 
-    async def wait_loop(self, seconds, fn, status):
-        LOG.debug(
-            "Entering timer wait loop for %r second interval (fn: %r)", seconds, fn
-        )
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
 
-        try:
-            while True:
-                LOG.debug("Wait loop waiting %r seconds...", seconds)
-                await asyncio.sleep(seconds)
+        # One scheduler serves every interval. Entries are ordered by
+        # their next fire time, with the interval index as a tie breaker
+        # so that handlers themselves are never compared.
+        heap = [
+            (loop.time() + seconds, index, seconds, fn, status)
+            for index, (seconds, fn, status) in enumerate(self.intervals)
+        ]  # type: List[Tuple[float, int, int, DeferredAction, InvocationStatus]]
+        heapq.heapify(heap)
 
+        LOG.debug("Entering timer scheduler for %r intervals", len(heap))
+
+        now = loop.time()
+
+        while True:
+            await asyncio.sleep(heap[0][0] - now)
+
+            # The clock is read once per wakeup. Every timer that has come
+            # due is re-armed from this reading rather than from the time
+            # its own handler was queued, so later timers in a pass may
+            # fire marginally early next time around.
+            now = loop.time()
+
+            due = []
+            while heap and heap[0][0] <= now:
+                due.append(heapq.heappop(heap))
+
+            # Due entries are re-armed only after all of them have been
+            # taken off the heap, so a zero second interval still waits
+            # for the next pass.
+            for _, index, seconds, fn, status in due:
                 try:
                     await self.queue.put(fn, status)
 
                 except asyncio.QueueFull:
                     LOG.debug("Ignoring full event queue and continuing timer loop")
-                    pass
 
-        except:  # noqa: E722
-            LOG.exception("Unexpected error in wait loop (%r, %r).", seconds, fn)
+                heapq.heappush(heap, (now + seconds, index, seconds, fn, status))
 
     async def start(self):
-        asyncio.gather(
-            *[
-                asyncio.create_task(self.wait_loop(seconds, fn, status))
-                for (seconds, fn, status) in self.intervals
-            ]
-        )
+        if not self.intervals:
+            return
+
+        # The event loop only keeps a weak reference to the task, so it
+        # is held here for the life of the context.
+        self.task = asyncio.create_task(self._run())
+        self.task.add_done_callback(self._on_scheduler_exit)
+
+    def _on_scheduler_exit(self, task: "asyncio.Task[None]"):
+        if task.cancelled():
+            return
+
+        ex = task.exception()
+        if ex is not None:
+            LOG.error("Unexpected error in timer scheduler.", exc_info=ex)
+        else:
+            LOG.warning("Timer scheduler exited: %r", task)
 
     def get_status(self) -> Sequence[InvocationStatus]:
-        return [status for (_, _, status) in self.intervals]
+        return self.statuses
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import logging
 from dataclasses import dataclass
-from functools import wraps
+from functools import partial
 from typing import List, Optional, Sequence
 
 from aiohttp import web
@@ -12,6 +13,7 @@ from ..api import (
     AuthorizationLevel,
     IntegrationWebhookResponse,
     IntegrationWebhookRoutes,
+    empty_success_response,
     json_response,
 )
 from .auth_handler import set_handler_auth
@@ -19,34 +21,41 @@ from .common import InvocationStatus, as_handler_invocation, without_return_valu
 from .integration_deferral_queue import IntegrationDeferralQueue
 from .log import LOG
 
-
-def empty_success_response() -> web.HTTPOk:
-    return web.HTTPOk()
+# Webhook routes are mounted under the integration's own path; the
+# instance ID segment is matched by aiohttp as a route variable.
+INTEGRATION_URL_PREFIX = "/integration/{integration_id}"
 
 
 @dataclass
 class WebhookRouteStatus(InvocationStatus):
+    __slots__ = ("url_path", "method")
+
     url_path: str
     method: str
 
 
 def get_http_response(hook_response: IntegrationWebhookResponse):
-    response = empty_success_response()  # type: web.Response
+    debug = LOG.isEnabledFor(logging.DEBUG)
 
-    if hook_response.response is not None:
-        LOG.debug("Returning 'response' field as HTTP response. ")
+    # Each response field is read once, in order of precedence.
+    explicit_response = hook_response.response
+    json_data = hook_response.json_response
 
-        response = hook_response.response
+    if explicit_response is not None:
+        if debug:
+            LOG.debug("Returning 'response' field as HTTP response. ")
 
-    elif hook_response.json_response is not None:
-        LOG.debug("Returning 'json_response' field as HTTP response")
+        response = explicit_response  # type: web.Response
 
-        response = json_response(
-            data=hook_response.json_response, status=hook_response.http_status
-        )
+    elif json_data is not None:
+        if debug:
+            LOG.debug("Returning 'json_response' field as HTTP response")
+
+        response = json_response(data=json_data, status=hook_response.http_status)
 
     elif hook_response.text_response is not None:
-        LOG.debug("Returning 'text_response' field as HTTP response")
+        if debug:
+            LOG.debug("Returning 'text_response' field as HTTP response")
 
         response = web.Response(
             text=hook_response.text_response,
@@ -55,7 +64,8 @@ def get_http_response(hook_response: IntegrationWebhookResponse):
         )
 
     elif hook_response.blob_response is not None:
-        LOG.debug("Returning 'blob_response' field as HTTP response")
+        if debug:
+            LOG.debug("Returning 'blob_response' field as HTTP response")
 
         response = web.Response(
             body=hook_response.blob_response,
@@ -64,13 +74,22 @@ def get_http_response(hook_response: IntegrationWebhookResponse):
         )
 
     else:
-        LOG.debug("Returning default successful HTTP response")
+        if debug:
+            LOG.debug("Returning default successful HTTP response")
+
+        # Only built when no other field applies.
+        response = empty_success_response()
 
-    LOG.debug("Webhook Response: %r", response)
+    if debug:
+        LOG.debug("Webhook Response: %r", response)
 
     return response
 
 
+async def _route_entry(fn, request: web.Request) -> web.StreamResponse:
+    return get_http_response(await fn(request))
+
+
 class IntegrationWebhookContext(IntegrationWebhookRoutes):
     def __init__(self, queue: IntegrationDeferralQueue, client: AIOPartyClient):
         self.route_table = RouteTableDef()
@@ -78,13 +97,6 @@ class IntegrationWebhookContext(IntegrationWebhookRoutes):
 
         self.routes = []  # type: List[WebhookRouteStatus]
 
-    def _with_resp_handling(self, status: "InvocationStatus", fn):
-        @wraps(fn)
-        async def wrapped(request):
-            return get_http_response(await fn(request))
-
-        return wrapped
-
     def _notice_hook_route(
         self, url_path: str, method: str, label: Optional[str]
     ) -> WebhookRouteStatus:
@@ -107,7 +119,7 @@ class IntegrationWebhookContext(IntegrationWebhookRoutes):
         return route_status
 
     def _url_path(self, url_suffix: Optional[str]):
-        return "/integration/{integration_id}" + (url_suffix or "")
+        return INTEGRATION_URL_PREFIX + (url_suffix or "")
 
     def post(
         self,
@@ -121,8 +133,8 @@ class IntegrationWebhookContext(IntegrationWebhookRoutes):
         def wrap_method(func):
             return set_handler_auth(
                 self.route_table.post(path=path)(
-                    self._with_resp_handling(
-                        hook_status,
+                    partial(
+                        _route_entry,
                         as_handler_invocation(self.client, hook_status, func),
                     )
                 ),
@@ -143,8 +155,8 @@ class IntegrationWebhookContext(IntegrationWebhookRoutes):
         def wrap_method(func):
             return set_handler_auth(
                 self.route_table.get(path=path)(
-                    self._with_resp_handling(
-                        hook_status,
+                    partial(
+                        _route_entry,
                         as_handler_invocation(self.client, hook_status, func),
                     )
                 ),
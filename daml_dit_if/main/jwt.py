@@ -1,33 +1,110 @@
 from __future__ import annotations
 
 import json
-from asyncio import shield, sleep
+import os
+import time
+from asyncio import gather, get_running_loop, shield, sleep
+from collections import OrderedDict
+from concurrent.futures import Executor, ThreadPoolExecutor
 from datetime import timedelta
-from typing import TYPE_CHECKING, Any, Collection, Mapping, Optional, Union
+from hashlib import sha256
+from typing import TYPE_CHECKING, Any, Collection, Mapping, Optional, Set, Tuple, Union
 
-from aiohttp import ClientSession
+from aiohttp import ClientSession, TCPConnector
 
 if TYPE_CHECKING:
     from jwcrypto.jwk import JWK
 
+from ..api.common import decode_json
 from .log import LOG
 
 DEFAULT_POLL_INTERVAL = timedelta(seconds=10)
 IAT_SKEW = timedelta(seconds=15)
 MAX_TOKEN_EXPIRY = timedelta(days=1)
 
+DEFAULT_TOKEN_CACHE_SIZE = 10000
+DEFAULT_TOKEN_CACHE_TTL = timedelta(seconds=60)
+
+MAX_VERIFY_WORKERS = 8
+
+# The JWKS endpoints are polled every few seconds, so connections to them
+# are kept alive and their host names cached between polls.
+JWKS_CONNECTION_LIMIT = 4
+JWKS_DNS_CACHE_TTL = 300
+JWKS_KEEPALIVE_TIMEOUT = 30
+
 
 JWTClaims = Mapping[str, Any]
 
 
+class TokenCache:
+    """
+    Bounded LRU cache of values derived from verified tokens. Entries are
+    keyed by a digest of the token, so raw tokens are never retained, and
+    expire after a fixed TTL or at the token's own expiry, whichever
+    comes first.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_TOKEN_CACHE_SIZE,
+        ttl: timedelta = DEFAULT_TOKEN_CACHE_TTL,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl.total_seconds()
+        self.entries = OrderedDict()  # type: OrderedDict[bytes, Tuple[float, Any]]
+
+    @staticmethod
+    def key(token: str) -> bytes:
+        return sha256(token.encode()).digest()
+
+    def get(self, key: bytes) -> Optional[Any]:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+
+        expiry, value = entry
+        if expiry <= time.time():
+            del self.entries[key]
+            return None
+
+        self.entries.move_to_end(key)
+        return value
+
+    def put(self, key: bytes, value: Any, exp: Optional[Any] = None) -> None:
+        expiry = time.time() + self.ttl
+        if isinstance(exp, (int, float)):
+            expiry = min(expiry, exp)
+
+        self.entries[key] = (expiry, value)
+        self.entries.move_to_end(key)
+
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+
 class JWTValidator:
-    def __init__(self, jwks_urls: Optional[Union[str, Collection[str]]] = None):
+    def __init__(
+        self,
+        jwks_urls: Optional[Union[str, Collection[str]]] = None,
+        executor: Optional[Executor] = None,
+    ):
         from jwcrypto.jwk import JWKSet
 
         self.jwks_urls = jwks_urls
         self.keys = JWKSet()
+        # Key IDs in ``keys``, maintained as keys are added so that each
+        # poll does not have to walk the key set.
+        self.known_kids = set()  # type: Set[str]
         self.session = None  # type: Optional[ClientSession]
 
+        # Signature verification is CPU bound, so it is run on a small
+        # thread pool to keep it from stalling the event loop. Unless one
+        # is supplied, the pool is created on first use and shut down by
+        # close().
+        self.executor = executor
+        self.owns_executor = executor is None
+
     async def poll(self, poll_interval: timedelta = DEFAULT_POLL_INTERVAL):
         """
         Periodically check for new keys. This coroutine will NEVER terminate naturally, so it should
@@ -44,11 +121,21 @@ class JWTValidator:
         from jwcrypto.jwt import JWT
 
         jwt = JWT(jwt=token)
-        key = jwt.token.jose_header["kid"]
-        LOG.debug("Verifying token with key: %r", key)
-        await self.get_key(key)
+        kid = jwt.token.jose_header["kid"]
+        LOG.debug("Verifying token with key: %r", kid)
+        key = await self.get_key(kid)
+
+        # Verify against the resolved key where there is one, so that the
+        # worker thread does not read the key set while it is refreshed.
+        return await get_running_loop().run_in_executor(
+            self._get_executor(), self._verify_claims, token, key or self.keys
+        )
+
+    @staticmethod
+    def _verify_claims(token: str, key: Any) -> JWTClaims:
+        from jwcrypto.jwt import JWT
 
-        jwt = JWT(jwt=token, key=self.keys)
+        jwt = JWT(jwt=token, key=key)
         return json.loads(jwt.claims)
 
     async def get_key(self, kid: str) -> Optional[JWK]:
@@ -71,81 +158,119 @@ class JWTValidator:
         """
         return self.keys.export(private_keys=False)
 
+    def _get_executor(self) -> Executor:
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(
+                max_workers=min(MAX_VERIFY_WORKERS, os.cpu_count() or 1),
+                thread_name_prefix="jwt-verify",
+            )
+
+        return self.executor
+
+    def _get_session(self) -> ClientSession:
+        if self.session is None:
+            self.session = ClientSession(
+                connector=TCPConnector(
+                    limit=JWKS_CONNECTION_LIMIT,
+                    ttl_dns_cache=JWKS_DNS_CACHE_TTL,
+                    keepalive_timeout=JWKS_KEEPALIVE_TIMEOUT,
+                )
+            )
+
+        return self.session
+
     async def _load_new_keys(self):
+        # The endpoints are independent, so they are fetched concurrently.
+        await gather(*[self._load_new_keys_from(url) for url in self.jwks_urls])
+
+    async def _load_new_keys_from(self, url: str):
         from jwcrypto.jwk import JWK
 
-        for url in self.jwks_urls:
-            try:
-                if self.session is None:
-                    self.session = ClientSession()
-
-                async with self.session.get(url, allow_redirects=False) as response:
-                    jwks_json = await response.json()
-
-                # ``JWKSet.import_keyset`` suffers from a few critical flaws that make it
-                # unusable for us:
-                #   1) ``import_keyset`` internally adds keys to a set, which is semantically
-                #      correct. However, because JWK has no __eq__ or __hash__ implementation,
-                #      EVERY key is repeatedly appended to the set rather than duplicates
-                #      getting filtered out.
-                #   2) The previous point necessitates that we pre-process the data to filter out
-                #      keys that we do not wish to add, thereby requiring us to parse the JSON
-                #      and read the payload. ``import_keyset`` expects its argument as a serialized
-                #      JSON string, which it promptly parses back into a data structure.
-                #
-                # We process JWKS endpoints ourselves and selectively add keys directly to the
-                # implementation. We are NOT reimplementing ``import_keyset``'s functionality of
-                # carrying additional non-``keys`` fields into the ``JWKSet`` object. We are
-                # generating JWKS data ourselves, and always generate data that contains only the
-                # single top-level property of ``keys`` so this has no impact on us.
-                jwks_keys = jwks_json.get("keys")
-                if jwks_keys is None:
+        try:
+            session = self._get_session()
+
+            async with session.get(url, allow_redirects=False) as response:
+                jwks_json = await response.json(loads=decode_json)
+
+            # ``JWKSet.import_keyset`` suffers from a few critical flaws that make it
+            # unusable for us:
+            #   1) ``import_keyset`` internally adds keys to a set, which is semantically
+            #      correct. However, because JWK has no __eq__ or __hash__ implementation,
+            #      EVERY key is repeatedly appended to the set rather than duplicates
+            #      getting filtered out.
+            #   2) The previous point necessitates that we pre-process the data to filter out
+            #      keys that we do not wish to add, thereby requiring us to parse the JSON
+            #      and read the payload. ``import_keyset`` expects its argument as a serialized
+            #      JSON string, which it promptly parses back into a data structure.
+            #
+            # We process JWKS endpoints ourselves and selectively add keys directly to the
+            # implementation. We are NOT reimplementing ``import_keyset``'s functionality of
+            # carrying additional non-``keys`` fields into the ``JWKSet`` object. We are
+            # generating JWKS data ourselves, and always generate data that contains only the
+            # single top-level property of ``keys`` so this has no impact on us.
+            jwks_keys = jwks_json.get("keys")
+            if jwks_keys is None:
+                LOG.warning(
+                    'The JWKS endpoint did not return a "keys" property, so no new '
+                    "keys were added. This will be retried"
+                )
+                return
+
+            for jwk_dict in jwks_keys:
+                kid = jwk_dict.get("kid")
+                if kid is None:
                     LOG.warning(
-                        'The JWKS endpoint did not return a "keys" property, so no new '
-                        "keys were added. This will be retried"
+                        'The JWKS endpoint contained a key without a "kid" field. '
+                        "It will be dropped."
                     )
-                    continue
-
-                existing_kids = {k.key_id for k in self.keys}
-                for jwk_dict in jwks_keys:
-                    kid = jwk_dict.get("kid")
-                    if kid is None:
-                        LOG.warning(
-                            'The JWKS endpoint contained a key without a "kid" field. '
-                            "It will be dropped."
-                        )
-                    elif kid in existing_kids:
-                        LOG.debug(
-                            "We already know about kid %s, so the new value will be "
-                            "ignored.",
-                            kid,
+                elif kid in self.known_kids:
+                    LOG.debug(
+                        "We already know about kid %s, so the new value will be "
+                        "ignored.",
+                        kid,
+                    )
+                else:
+                    jwk = None
+                    try:
+                        jwk = JWK(**jwk_dict)
+                    except Exception:  # noqa
+                        LOG.exception(
+                            f"The JWK identified by {kid} could not be parsed."
                         )
-                    else:
-                        jwk = None
+
+                    if jwk is not None:
                         try:
-                            jwk = JWK(**jwk_dict)
+                            self.keys.add(jwk)
+                            self.known_kids.add(kid)
                         except Exception:  # noqa
                             LOG.exception(
-                                f"The JWK identified by {kid} could not be parsed."
+                                f"The JWK identified by {kid} could not be added."
                             )
 
-                        if jwk is not None:
-                            try:
-                                self.keys.add(jwk)
-                            except Exception:  # noqa
-                                LOG.exception(
-                                    f"The JWK identified by {kid} could not be added."
-                                )
-
-            except Exception as ex:  # noqa
-                # Do NOT log these with full stack traces because they're actually fairly common,
-                # particularly at startup when user-service has yet to start. Merely logging the
-                # text of the exception without a scary stack trace is sufficient.
-                LOG.warning("Error when checking url %r for new keys: %s", url, ex)
+        except Exception as ex:  # noqa
+            # Do NOT log these with full stack traces because they're actually fairly common,
+            # particularly at startup when user-service has yet to start. Merely logging the
+            # text of the exception without a scary stack trace is sufficient.
+            LOG.warning("Error when checking url %r for new keys: %s", url, ex)
 
     async def __aenter__(self):
+        self._get_session()
         return self
 
+    async def close(self) -> None:
+        """
+        Close the HTTP session used to fetch keys, and shut down the
+        verification thread pool if the validator created it.
+        """
+        session = self.session
+        if session is not None:
+            self.session = None
+            await session.close()
+
+        executor = self.executor
+        if executor is not None and self.owns_executor:
+            self.executor = None
+            executor.shutdown(wait=False)
+
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session is not None:
-            await self.session.close()
+        await self.close()
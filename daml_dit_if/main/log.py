@@ -13,6 +13,12 @@ import typing
 
 _level = 0
 
+# Whether the framework's own debug logging is enabled, kept in step with
+# _level by set_log_level. Read it through the module (or via
+# is_debug_enabled) rather than importing the name, which would capture
+# the value at import time.
+DEBUG_ENABLED = False
+
 
 LOG = logging.getLogger("daml-dit-if")
 
@@ -42,11 +48,11 @@ def get_log_level():
 
 
 def is_debug_enabled():
-    return get_log_level() >= 20
+    return DEBUG_ENABLED
 
 
 def set_log_level(level):
-    global _level
+    global _level, DEBUG_ENABLED
 
     if level < 0 or level > 50:
         FAIL(f"Requested log level, {level}, is out of the valid range [0,50].")
@@ -67,6 +73,7 @@ def set_log_level(level):
     logging.getLogger().setLevel(logging.DEBUG if level >= 40 else logging.INFO)
 
     _level = level
+    DEBUG_ENABLED = level >= 20
 
 
 def get_log_level_options():
@@ -7,7 +7,7 @@ import sys
 from asyncio import ensure_future, gather, get_event_loop
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Any, Awaitable, Dict, Optional
 
 import pkg_resources
 import yaml
@@ -28,7 +28,7 @@ from yarl import URL
 from .config import Configuration, get_default_config, optenv
 from .integration_context import IntegrationContext
 from .log import FAIL, LOG, set_log_level, setup_default_logging
-from .package_metadata_introspection import get_package_metadata
+from .package_metadata_introspection import YAML_LOADER, get_package_metadata
 from .web import start_web_endpoint
 
 
@@ -38,7 +38,7 @@ def load_integration_spec(config: Configuration) -> Optional[IntegrationRuntimeS
     if spec_path.exists():
         LOG.debug("Loading integration spec from: %r", spec_path)
 
-        yaml_spec = yaml.safe_load(spec_path.read_bytes())
+        yaml_spec = yaml.load(spec_path.read_bytes(), Loader=YAML_LOADER)
 
         LOG.info("Integration spec: %r", yaml_spec)
 
@@ -71,6 +71,25 @@ async def run_dazl_network(network: Network):
     FAIL("Execution cannot continue without dazl coroutine.")
 
 
+async def _run_together(*aws: Awaitable[Any]):
+    """
+    Run the given awaitables concurrently until they all finish. On
+    Python 3.11 and later, a failure in one cancels the others before
+    the error propagates; earlier versions fall back to gather.
+    """
+    task_group = getattr(asyncio, "TaskGroup", None)
+    if task_group is None:
+        await gather(*aws)
+        return
+
+    async def join(aw: Awaitable[Any]):
+        await aw
+
+    async with task_group() as tg:
+        for aw in aws:
+            tg.create_task(join(aw))
+
+
 async def _aio_main(
     integration_type: IntegrationTypeInfo,
     config: Configuration,
@@ -97,7 +116,9 @@ async def _aio_main(
         integration_startup_coro = integration_context.safe_start()
 
         LOG.info("Starting main loop.")
-        await gather(web_coro, dazl_coro, integration_coro, integration_startup_coro)
+        await _run_together(
+            web_coro, dazl_coro, integration_coro, integration_startup_coro
+        )
 
         return True
 
@@ -114,17 +135,34 @@ def _get_integration_types(metadata: PackageMetadata) -> Dict[str, IntegrationTy
     return {itype.id: itype for itype in package_itypes}
 
 
+def _install_event_loop_policy():
+    """
+    Run on uvloop when it is installed, falling back to the standard
+    asyncio event loop otherwise.
+    """
+    try:
+        import uvloop
+    except ImportError:
+        LOG.debug("uvloop unavailable, using the default asyncio event loop.")
+        return
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    LOG.info("Using uvloop event loop.")
+
+
 def main():
     setup_default_logging()
 
     LOG.info("Initializing dabl-integration...")
 
-    # Parsing certain DAML-LF modules causes very deep stacks;
-    # increase the standard limit to be able to handle those.
-    sys.setrecursionlimit(10000)
-
     config = get_default_config()
 
+    # Parsing certain DAML-LF modules causes very deep stacks;
+    # increase the standard limit to be able to handle those. A
+    # limit of zero leaves the interpreter default in place.
+    if config.recursion_limit > 0:
+        sys.setrecursionlimit(config.recursion_limit)
+
     set_log_level(config.log_level)
 
     metadata = get_package_metadata(config)
@@ -154,6 +192,8 @@ def main():
     if integration_spec:
         LOG.info("Running integration type: %r...", type_id)
 
+        _install_event_loop_policy()
+
         loop = get_event_loop()
 
         if not loop.run_until_complete(
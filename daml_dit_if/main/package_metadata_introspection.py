@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import os
 import sys
+from functools import lru_cache
 from typing import Optional
-from zipfile import ZipFile
+from zipfile import ZipFile, is_zipfile
 
 import yaml
 from dacite import from_dict
@@ -16,6 +18,9 @@ from daml_dit_api import (
 from .config import Configuration
 from .log import LOG
 
+# Prefer the libyaml-backed loader when PyYAML was built with it.
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 def _get_local_dabl_meta(config: Configuration) -> Optional[str]:
     dit_meta_path = config.dit_meta_path
@@ -33,12 +38,19 @@ def _get_local_dabl_meta(config: Configuration) -> Optional[str]:
 def _get_pex_dabl_meta() -> Optional[str]:
     pex_filename = sys.argv[0]
 
+    # PEX files are zip archives behind a shebang line, so they cannot be
+    # recognized by their leading bytes. is_zipfile instead checks for the
+    # archive trailer, which is enough to skip plain scripts and
+    # interactive runs without treating them as failed PEX reads.
+    if not (os.path.isfile(pex_filename) and is_zipfile(pex_filename)):
+        LOG.debug("Not running from a PEX file: %r", pex_filename)
+        return None
+
     LOG.debug("Attmpting to load DABL metadata from PEX file: %r", pex_filename)
 
     try:
         with ZipFile(pex_filename) as zf:
-            with zf.open(DABL_META_NAME) as meta_file:
-                return meta_file.read().decode("UTF-8")
+            return zf.read(DABL_META_NAME).decode("UTF-8")
     except:  # noqa
         LOG.error(
             f"Failed to read {DABL_META_NAME} from PEX file {pex_filename}"
@@ -47,11 +59,18 @@ def _get_pex_dabl_meta() -> Optional[str]:
         return None
 
 
+# The metadata does not change for the life of the process, so it is
+# read and parsed at most once per configuration.
+@lru_cache(maxsize=4)
 def get_package_metadata(config: Configuration) -> PackageMetadata:
     dabl_meta = _get_pex_dabl_meta() or _get_local_dabl_meta(config)
 
     if dabl_meta:
-        return from_dict(data_class=PackageMetadata, data=yaml.safe_load(dabl_meta))
+        LOG.debug("Parsing DABL metadata with YAML loader: %s", YAML_LOADER.__name__)
+
+        return from_dict(
+            data_class=PackageMetadata, data=yaml.load(dabl_meta, Loader=YAML_LOADER)
+        )
 
     raise Exception(
         f"Could not find {DABL_META_NAME}, either in running DIT "
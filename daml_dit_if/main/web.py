@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-import re
-from asyncio import ensure_future, gather
-from dataclasses import asdict
-from typing import Optional
+import time
+from asyncio import ensure_future, gather, get_running_loop
+from dataclasses import fields, is_dataclass
+from typing import Any, Dict, Optional, Tuple
 
+from aiohttp import web
 from aiohttp.web import (
     AccessLogger,
     Application,
@@ -13,107 +14,229 @@ from aiohttp.web import (
     HTTPOk,
     Request,
     Response,
-    RouteTableDef,
     StreamResponse,
     TCPSite,
+    get,
+    post,
 )
 from prometheus_client import REGISTRY, exposition, generate_latest
 
 from ..api import json_response
+from ..api.common import decode_json, encode_json
+from . import log
 from .auth_handler import AuthHandler, AuthorizationLevel, auth_level
 from .config import Configuration
 from .integration_context import IntegrationContext
 from .jwt import JWTValidator
-from .log import (
-    LOG,
-    get_log_level,
-    get_log_level_options,
-    is_debug_enabled,
-    set_log_level,
-)
+from .log import LOG, get_log_level, get_log_level_options, set_log_level
 
 # cap aiohttp to allow a maximum of 100 MB for the size of a body.
 CLIENT_MAX_SIZE = 100 * (1024**2)
 
-LOG_SUPPRESSED_ROUTE_REGEX = re.compile(
-    "^(/integration/[\w]+)?/((healthz)|(status)|(metrics))$"
-)
+# Polled routes, served either at the root or under a single
+# /integration/<id> prefix, that are left out of the access log.
+LOG_SUPPRESSED_ROUTE_NAMES = frozenset(("healthz", "status", "metrics"))
+LOG_SUPPRESSED_ROUTE_PREFIX = "/integration/"
+
+
+# Status polls arriving within this many seconds of each other are
+# served the same status.
+STATUS_CACHE_TTL = 0.25
+
+# Upper bound on the number of distinct request URLs whose formatted
+# "_self" value is kept. Probes poll a handful of fixed URLs, so the
+# cache is simply emptied if arbitrary URLs ever fill it.
+SELF_URL_CACHE_SIZE = 64
+
+# Field names of each status dataclass, resolved on first use.
+_STATUS_FIELDS = {}  # type: Dict[type, Tuple[str, ...]]
+
+
+def _status_to_dict(status: Any) -> Dict[str, Any]:
+    """
+    Convert a status dataclass to a dict, as dataclasses.asdict does but
+    with each class's fields looked up only once. Status records hold
+    scalars, nested records and sequences of records, so the values
+    need no deep copy.
+    """
+    status_class = type(status)
+
+    names = _STATUS_FIELDS.get(status_class)
+    if names is None:
+        names = tuple(f.name for f in fields(status_class))
+        _STATUS_FIELDS[status_class] = names
+
+    return {name: _status_value(getattr(status, name)) for name in names}
+
 
+def _status_value(value: Any) -> Any:
+    if type(value) in _STATUS_FIELDS or is_dataclass(value):
+        return _status_to_dict(value)
+    elif isinstance(value, (list, tuple)):
+        return [_status_value(item) for item in value]
+    else:
+        return value
+
+
+def _app_key(name: str, value_type: Any) -> Any:
+    # aiohttp 3.9 and later warn about plain string application keys,
+    # but earlier releases have no AppKey.
+    app_key = getattr(web, "AppKey", None)
+
+    return name if app_key is None else app_key(name, value_type)
+
+
+# The integration context served by the control routes, and the
+# status (less the per-request "_self" member) together with the
+# monotonic time until which it may be served to status polls.
+INTEGRATION_CONTEXT_KEY = _app_key("integration_context", IntegrationContext)
+STATUS_CACHE_KEY = _app_key("status_cache", Dict[str, Any])
 
-def _build_control_routes(integration_context: IntegrationContext) -> RouteTableDef:
-    routes = RouteTableDef()
+# The formatted "_self" URL of the status, keyed by the parts of the
+# request that determine it.
+SELF_URL_CACHE_KEY = _app_key("self_url_cache", Dict[Tuple[str, str, str], str])
 
-    def _get_status(request: Request):
-        return {
-            **asdict(integration_context.get_status()),
-            "log_level": get_log_level(),
-            "log_level_options": get_log_level_options(),
-            "_self": str(request.url),
-        }
+# The validator for request tokens, closed along with the application.
+JWT_VALIDATOR_KEY = _app_key("jwt_validator", JWTValidator)
 
-    @routes.get("/integration/{integration_id}/healthz")
-    @auth_level(AuthorizationLevel.ANY_PARTY)
-    async def get_container_health(request: Request) -> Response:
-        response_dict = {**_get_status(request), "_self": str(request.url)}
-        return json_response(response_dict)
 
-    @routes.get("/integration/{integration_id}/status")
-    @auth_level(AuthorizationLevel.ANY_PARTY)
-    async def get_container_status(request: Request) -> Response:
-        return json_response(_get_status(request))
+def _get_status(integration_context: IntegrationContext) -> Dict[str, Any]:
+    status = _status_to_dict(integration_context.get_status())
+    status["log_level"] = get_log_level()
+    status["log_level_options"] = get_log_level_options()
+    return status
 
-    @routes.post("/integration/{integration_id}/log-level")
-    @auth_level(AuthorizationLevel.ANY_PARTY)
-    async def set_level(request: Request) -> Response:
-        body = await request.json()
 
-        set_log_level(int(body["log_level"]))
+def _get_status_response(request: Request) -> Response:
+    status_cache = request.app[STATUS_CACHE_KEY]
+
+    now = time.monotonic()
+    if now >= status_cache["expiry"]:
+        status_cache["status"] = _get_status(request.app[INTEGRATION_CONTEXT_KEY])
+        status_cache["expiry"] = now + STATUS_CACHE_TTL
+
+    status = status_cache["status"].copy()
+    status["_self"] = _get_self_url(request)
+
+    return Response(
+        body=encode_json(status), content_type="application/json", charset="utf-8"
+    )
+
 
-        return json_response(body)
+def _get_self_url(request: Request) -> str:
+    self_urls = request.app[SELF_URL_CACHE_KEY]
 
-    # The control routes are duplicated at paths that are not
-    # qualified by an '/integration/{integration_id}' prefix. Due to
-    # the lack of the prefix, these are private URLs that are only
-    # addressible within the cluster. They have historically been used
-    # to allow the console access to integration controls via a
-    # secured proxy. As integrations migrate to model where security
-    # is implemented internally, these will be deprecated and replaced
-    # entirely with the secured external endpoints above.
-    @routes.get("/healthz")
-    async def internal_get_container_health(request: Request) -> StreamResponse:
-        return await get_container_health(request)
+    key = (request.scheme, request.host, request.raw_path)
+    self_url = self_urls.get(key)
 
-    @routes.get("/status")
-    async def internal_get_container_status(request: Request) -> StreamResponse:
-        return await get_container_status(request)
+    if self_url is None:
+        if len(self_urls) >= SELF_URL_CACHE_SIZE:
+            self_urls.clear()
 
-    @routes.post("/log-level")
-    async def internal_set_level(request: Request) -> StreamResponse:
-        return await set_level(request)
+        self_url = str(request.url)
+        self_urls[key] = self_url
 
-    @routes.get("/metrics")
-    async def metrics(request: Request) -> StreamResponse:
-        if accept_header := request.headers.get("Accept"):
-            encoder, _ = exposition.choose_encoder(accept_header)
-        else:
-            encoder = generate_latest
+    return self_url
 
-        metrics_bytes: bytes = encoder(REGISTRY)
-        return HTTPOk(body=metrics_bytes, content_type="text/plain; version=0.0.4")
 
-    return routes
+@auth_level(AuthorizationLevel.ANY_PARTY)
+async def get_container_health(request: Request) -> Response:
+    return _get_status_response(request)
+
+
+@auth_level(AuthorizationLevel.ANY_PARTY)
+async def get_container_status(request: Request) -> Response:
+    return _get_status_response(request)
+
+
+@auth_level(AuthorizationLevel.ANY_PARTY)
+async def set_level(request: Request) -> Response:
+    body = await request.json(loads=decode_json)
+
+    set_log_level(int(body["log_level"]))
+    request.app[STATUS_CACHE_KEY]["expiry"] = 0.0
+
+    return json_response(body)
+
+
+async def metrics(request: Request) -> StreamResponse:
+    if accept_header := request.headers.get("Accept"):
+        encoder, _ = exposition.choose_encoder(accept_header)
+    else:
+        encoder = generate_latest
+
+    metrics_bytes: bytes = encoder(REGISTRY)
+    return HTTPOk(body=metrics_bytes, content_type="text/plain; version=0.0.4")
+
+
+CONTROL_ROUTES = [
+    get("/integration/{integration_id}/healthz", get_container_health),
+    get("/integration/{integration_id}/status", get_container_status),
+    post("/integration/{integration_id}/log-level", set_level),
+    get("/metrics", metrics),
+]
+
+# The control routes are duplicated at paths that are not
+# qualified by an '/integration/{integration_id}' prefix. Due to
+# the lack of the prefix, these are private URLs that are only
+# addressible within the cluster. They have historically been used
+# to allow the console access to integration controls via a
+# secured proxy. As integrations migrate to model where security
+# is implemented internally, these will be deprecated and replaced
+# entirely with the secured external endpoints above.
+#
+# These bind the same handlers, but are added at the public level so
+# that they are served without an authorization check.
+INTERNAL_CONTROL_ROUTES = [
+    get("/healthz", get_container_health),
+    get("/status", get_container_status),
+    post("/log-level", set_level),
+]
 
 
 def _log_suppressed_route(path: str) -> bool:
-    return LOG_SUPPRESSED_ROUTE_REGEX.match(path) is not None
+    prefix, sep, name = path.rpartition("/")
+
+    if not sep or name not in LOG_SUPPRESSED_ROUTE_NAMES:
+        return False
+
+    if not prefix:
+        return True
+
+    if not prefix.startswith(LOG_SUPPRESSED_ROUTE_PREFIX):
+        return False
+
+    # The integration id is a single, non-empty segment of word
+    # characters, as matched by the regular expression [\w]+. Those are
+    # the characters str.isalnum accepts, together with the underscore.
+    integration_id = prefix[len(LOG_SUPPRESSED_ROUTE_PREFIX) :]
+    return integration_id.replace("_", "a").isalnum()
+
+
+def _add_control_routes(
+    app: Application, auth_handler: AuthHandler, integration_context: IntegrationContext
+) -> None:
+    app[INTEGRATION_CONTEXT_KEY] = integration_context
+    app[STATUS_CACHE_KEY] = {"expiry": 0.0, "status": {}}
+    app[SELF_URL_CACHE_KEY] = {}
+
+    auth_handler.add_routes(app, CONTROL_ROUTES)
+    auth_handler.add_routes(
+        app, INTERNAL_CONTROL_ROUTES, auth=AuthorizationLevel.PUBLIC
+    )
+
+
+async def _close_jwt_validator(app: Application) -> None:
+    await app[JWT_VALIDATOR_KEY].close()
 
 
 class IntegrationAccessLogger(AccessLogger):
     def log(self, request: BaseRequest, response: StreamResponse, time: float):
-        path = request.rel_url.path
-
-        # Suppress polled routes to avoid cluttering the logs.
-        if _log_suppressed_route(path) and not is_debug_enabled():
+        # Suppress polled routes to avoid cluttering the logs. The debug
+        # flag is read straight off the log module, which keeps it in step
+        # with the log level, and is checked first so that the path is
+        # only examined when suppression is possible.
+        if not log.DEBUG_ENABLED and _log_suppressed_route(request.rel_url.path):
             return
 
         return super().log(request, response, time)
@@ -134,6 +257,9 @@ async def start_web_endpoint(
         LOG.info("JWKS URL: %r", config.jwks_url)
         jwt = JWTValidator(jwks_urls=[config.jwks_url])
 
+        app[JWT_VALIDATOR_KEY] = jwt
+        app.on_cleanup.append(_close_jwt_validator)
+
         web_coros.append(ensure_future(jwt.poll()))
     else:
         LOG.warn(
@@ -143,10 +269,10 @@ async def start_web_endpoint(
     auth_handler = AuthHandler(config, jwt)
     await auth_handler.setup(app)
 
-    app.add_routes(_build_control_routes(integration_context))
+    _add_control_routes(app, auth_handler, integration_context)
 
     if integration_context.webhook_context:
-        app.add_routes(integration_context.webhook_context.route_table)
+        auth_handler.add_routes(app, integration_context.webhook_context.route_table)
 
     LOG.info("Starting web server on %s...", config.health_port)
     runner = AppRunner(
@@ -161,4 +287,9 @@ async def start_web_endpoint(
 
     LOG.info("...Web server started")
 
-    return gather(*web_coros)
+    try:
+        # Serve until cancelled, at which point the runner's cleanup stops
+        # the site and runs the application's cleanup handlers.
+        await gather(*web_coros, get_running_loop().create_future())
+    finally:
+        await runner.cleanup()
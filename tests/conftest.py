@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from typing import Callable
+
+import pytest
+
+from daml_dit_if.main.common import InvocationStatus
+from daml_dit_if.main.config import Configuration, get_default_config
+
+
+@pytest.fixture
+def config(monkeypatch) -> Configuration:
+    for name in ("DABL_JWKS_URL", "DABL_LEDGER_ID", "DAML_LEDGER_PARTY"):
+        monkeypatch.delenv(name, raising=False)
+
+    return replace(get_default_config(), ledger_id="test-ledger", run_as_party="Alice")
+
+
+@pytest.fixture
+def make_status() -> Callable[..., InvocationStatus]:
+    def make(label: str = "default") -> InvocationStatus:
+        return InvocationStatus(
+            index=0,
+            label=label,
+            command_count=0,
+            use_count=0,
+            error_count=0,
+            error_message=None,
+            error_time=None,
+        )
+
+    return make
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import pytest
+
+from daml_dit_if.main.auth_accessors import (
+    DABL_JWT_LEDGER_CLAIMS,
+    claimed_parties,
+    get_single_request_party,
+)
+
+
+@pytest.mark.parametrize(
+    "read_as, act_as, expected",
+    [
+        (["Alice", "Bob"], ["Bob"], ["Bob"]),
+        (["Alice", "Alice"], ["Alice", "Bob"], ["Alice"]),
+        ([f"P{index}" for index in range(8)], ["P3", "P3", "P9"], ["P3"]),
+        ([], ["Alice"], []),
+    ],
+    ids=["overlap", "duplicates", "long-list", "empty"],
+)
+def test_claimed_parties(read_as, act_as, expected):
+    ledger_claims = {"readAs": read_as, "actAs": act_as}
+
+    assert list(claimed_parties(ledger_claims)) == expected
+
+
+def test_single_request_party():
+    def request(parties):
+        return {DABL_JWT_LEDGER_CLAIMS: {"readAs": parties, "actAs": parties}}
+
+    assert get_single_request_party({}) is None
+    assert get_single_request_party(request([])) is None
+    assert get_single_request_party(request(["Alice"])) == "Alice"
+
+    with pytest.raises(Exception, match=r"\['Alice', 'Bob'\]"):
+        get_single_request_party(request(["Alice", "Bob"]))
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+from contextlib import asynccontextmanager
+from dataclasses import replace
+from functools import wraps
+
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+from aiohttp.web import Application, Request, Response, get
+
+import daml_dit_if.main  # noqa: F401  (daml_dit_if.api must follow main)
+from daml_dit_if.api import AuthorizationLevel
+from daml_dit_if.main.auth_handler import (
+    AuthHandler,
+    auth_level,
+    get_handler_auth_level,
+)
+
+LEDGER_CLAIMS = {
+    "ledgerId": "test-ledger",
+    "actAs": ["Alice"],
+    "readAs": ["Alice"],
+}
+
+
+class _Decoder:
+    def __init__(self, ledger_claims=LEDGER_CLAIMS):
+        self.ledger_claims = ledger_claims
+        self.decoded = 0
+
+    async def decode_claims(self, token):
+        self.decoded += 1
+        return {"https://daml.com/ledger-api": self.ledger_claims}
+
+
+async def _report_level(request: Request) -> Response:
+    return Response(text=get_handler_auth_level(request).value)
+
+
+@auth_level(AuthorizationLevel.ANY_PARTY)
+async def _secured(request: Request) -> Response:
+    return await _report_level(request)
+
+
+def _logged(handler):
+    @wraps(handler)
+    async def logged(request: Request) -> Response:
+        return await handler(request)
+
+    return logged
+
+
+@asynccontextmanager
+async def _client(config, decoder, register):
+    app = Application()
+    auth_handler = AuthHandler(replace(config, token_cache_size=0), decoder)
+
+    await auth_handler.setup(app)
+    register(app, auth_handler)
+
+    async with TestClient(TestServer(app)) as client:
+        yield client
+
+
+@pytest.mark.asyncio
+async def test_routes_registered_directly_fail_closed(config):
+    def register(app, auth_handler):
+        app.router.add_get("/secured", _secured)
+        app.router.add_get("/public", _report_level)
+
+    async with _client(config, None, register) as client:
+        assert len(client.app.middlewares) == 1
+
+        response = await client.get("/secured")
+        assert response.status == 401
+
+        response = await client.get("/public")
+        assert response.status == 200
+        assert await response.text() == "DABL_PUBLIC"
+
+
+@pytest.mark.asyncio
+async def test_routes_are_authorized_once(config):
+    decoder = _Decoder()
+
+    def register(app, auth_handler):
+        auth_handler.add_routes(app, [get("/secured", _secured)])
+
+    async with _client(config, decoder, register) as client:
+        assert not client.app.middlewares
+
+        headers = {"Authorization": "Bearer some-token"}
+
+        response = await client.get("/secured", headers=headers)
+        assert response.status == 200
+        assert await response.text() == "DABL_ANY_PARTY"
+
+        response = await client.get("/secured")
+        assert response.status == 401
+
+    assert decoder.decoded == 1
+
+
+@pytest.mark.asyncio
+async def test_public_routes_registered_directly_install_no_middleware(config):
+    def register(app, auth_handler):
+        app.router.add_get("/public", _report_level)
+        auth_handler.add_routes(app, [get("/secured", _secured)])
+
+    async with _client(config, None, register) as client:
+        assert not client.app.middlewares
+
+        response = await client.get("/public")
+        assert response.status == 200
+
+
+@pytest.mark.asyncio
+async def test_wrapped_handlers_keep_their_level(config):
+    def register(app, auth_handler):
+        app.router.add_get("/direct", _logged(_secured))
+        auth_handler.add_routes(app, [get("/added", _logged(_secured))])
+
+    async with _client(config, None, register) as client:
+        response = await client.get("/direct")
+        assert response.status == 401
+
+        response = await client.get("/added")
+        assert response.status == 401
+
+
+@pytest.mark.parametrize(
+    "ledger_claims, status",
+    [
+        (LEDGER_CLAIMS, 200),
+        ({**LEDGER_CLAIMS, "readAs": ["Bob"]}, 401),
+        ({**LEDGER_CLAIMS, "ledgerId": "other-ledger"}, 401),
+    ],
+    ids=["claimed", "unclaimed", "other-ledger"],
+)
+@pytest.mark.asyncio
+async def test_integration_party_must_be_claimed(config, ledger_claims, status):
+    def register(app, auth_handler):
+        auth_handler.add_routes(
+            app, [get("/party", _secured)], auth=AuthorizationLevel.INTEGRATION_PARTY
+        )
+
+    async with _client(config, _Decoder(ledger_claims), register) as client:
+        headers = {"Authorization": "Bearer some-token"}
+
+        response = await client.get("/party", headers=headers)
+        assert response.status == status
+
+
+@pytest.mark.asyncio
+async def test_route_level_overrides_handler_level(config):
+    def register(app, auth_handler):
+        auth_handler.add_routes(app, [get("/secured", _secured)])
+        auth_handler.add_routes(
+            app, [get("/public", _secured)], auth=AuthorizationLevel.PUBLIC
+        )
+
+    async with _client(config, None, register) as client:
+        response = await client.get("/public")
+        assert response.status == 200
+        assert await response.text() == "DABL_PUBLIC"
+
+        response = await client.head("/public")
+        assert response.status == 200
+
+        response = await client.head("/secured")
+        assert response.status == 401
+
+
+def test_authorization_level_values():
+    assert [level.value for level in AuthorizationLevel] == [
+        "DABL_PUBLIC",
+        "DABL_ANY_PARTY",
+        "DABL_INTEGRATION_PARTY",
+    ]
+    assert AuthorizationLevel("DABL_ANY_PARTY") is AuthorizationLevel.ANY_PARTY
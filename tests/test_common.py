@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import json
+import warnings
+from dataclasses import dataclass
+from datetime import date
+from enum import Enum
+from uuid import UUID
+
+import pytest
+
+import daml_dit_if.main  # noqa: F401  (daml_dit_if.api must follow main)
+from daml_dit_if.api import common
+from daml_dit_if.api.common import (
+    DEFAULT_ENCODER,
+    bad_request,
+    encode_json,
+    forbidden_response,
+    internal_server_error,
+    not_found_response,
+    unauthorized_response,
+)
+
+
+class _Level(Enum):
+    LOW = 1
+    HIGH = "high"
+
+
+@dataclass
+class _Point:
+    x: int
+    y: int
+
+
+@pytest.mark.parametrize(
+    "error_response, status",
+    [
+        (unauthorized_response, 401),
+        (forbidden_response, 403),
+        (not_found_response, 404),
+        (bad_request, 400),
+        (internal_server_error, 500),
+    ],
+)
+def test_error_response(error_response, status):
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+
+        response = error_response("some_code", 'a "quoted" description')
+
+    assert response.status == status
+    assert response.content_type == "application/json"
+    assert response.charset == "utf-8"
+    assert response.text.endswith("\n")
+    assert json.loads(response.text) == {
+        "code": "some_code",
+        "description": 'a "quoted" description',
+    }
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"value": 2**64},
+        {"value": -(2**70)},
+        {"value": float("nan"), "other": None},
+        [1.5, float("inf")],
+        {"nested": [{"value": float("-inf")}]},
+        {"level": _Level.HIGH, "levels": [_Level.LOW]},
+        {"id": UUID("12345678-1234-5678-1234-567812345678")},
+        {1: "one", 2.5: "two and a half"},
+    ],
+    ids=[
+        "wide-int",
+        "wide-negative-int",
+        "nan",
+        "inf",
+        "nested-inf",
+        "enum",
+        "uuid",
+        "int-keys",
+    ],
+)
+@pytest.mark.parametrize("has_orjson", [True, False], ids=["orjson", "stdlib"])
+def test_encode_json_matches_default_encoder_for_edge_values(
+    monkeypatch, has_orjson, data
+):
+    monkeypatch.setattr(common, "HAS_ORJSON", has_orjson and common.HAS_ORJSON)
+
+    encoded = encode_json(data)
+
+    # NaN and infinities are compared by their spelling, since NaN is
+    # not equal to itself.
+    assert encoded.endswith(b"\n")
+    assert json.loads(encoded, parse_constant=str) == json.loads(
+        DEFAULT_ENCODER.encode(data), parse_constant=str
+    )
+
+
+@pytest.mark.parametrize(
+    "data",
+    [{"value": _Point(1, 2)}, {date(2020, 1, 1): "new year"}],
+    ids=["dataclass", "date-key"],
+)
+@pytest.mark.parametrize("has_orjson", [True, False], ids=["orjson", "stdlib"])
+def test_encode_json_rejects_what_the_default_encoder_rejects(
+    monkeypatch, has_orjson, data
+):
+    monkeypatch.setattr(common, "HAS_ORJSON", has_orjson and common.HAS_ORJSON)
+
+    with pytest.raises(TypeError):
+        DEFAULT_ENCODER.encode(data)
+
+    with pytest.raises(TypeError):
+        encode_json(data)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [{"a": 1, "b": [1.5, None, "text"]}, [], {"flag": True, "missing": None}],
+)
+def test_encode_json(data):
+    encoded = encode_json(data)
+
+    assert encoded.endswith(b"\n")
+    assert json.loads(encoded) == data
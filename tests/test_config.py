@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import pytest
+
+from daml_dit_if.main.config import get_default_config
+
+
+def test_environment_values_are_converted(monkeypatch, config):
+    monkeypatch.setenv("DABL_QUEUE_SIZE", "64")
+    monkeypatch.setenv("DABL_LEDGER_ID", "some-ledger")
+    monkeypatch.setenv("DAML_LEDGER_PARTY", "Bob")
+
+    loaded = get_default_config()
+
+    assert loaded.queue_size == 64
+    assert loaded.ledger_id == "some-ledger"
+    assert loaded.run_as_party == "Bob"
+    assert loaded.jwks_url is None
+
+
+def test_invalid_environment_value_names_the_conversion(monkeypatch, caplog):
+    monkeypatch.setenv("DABL_QUEUE_SIZE", "many")
+
+    with pytest.raises(SystemExit):
+        get_default_config()
+
+    assert "Invalid int many in environment variable: DABL_QUEUE_SIZE" in caplog.text
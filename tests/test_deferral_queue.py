@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from dataclasses import replace
+
+import pytest
+
+from daml_dit_if.main.integration_deferral_queue import (
+    DRAIN_YIELD_INTERVAL,
+    IntegrationDeferralQueue,
+)
+from daml_dit_if.main.log import LOG
+
+
+@asynccontextmanager
+async def _running_queue(config, concurrency):
+    queue = IntegrationDeferralQueue(
+        replace(config, queue_size=0, queue_concurrency=concurrency)
+    )
+
+    worker = asyncio.ensure_future(queue.start())
+    try:
+        yield queue
+    finally:
+        worker.cancel()
+
+
+async def _until(done):
+    async def wait():
+        while not done():
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(wait(), timeout=5)
+
+
+@pytest.mark.asyncio
+async def test_unkeyed_entries_stay_in_order_with_concurrency(config, make_status):
+    handled = []
+
+    async def handle(name, delay):
+        await asyncio.sleep(delay)
+        handled.append(name)
+
+    async with _running_queue(config, 4) as queue:
+        # Stand-ins for the create and archive handlers of one contract,
+        # and for transaction start and end handlers. Each later entry
+        # would finish first if they were allowed to overlap.
+        for index, name in enumerate(["start", "created", "archived", "end"]):
+            queue.put_nowait(handle, make_status(name), name, 0.02 - index * 0.005)
+
+        await _until(lambda: len(handled) >= 4)
+
+    assert handled == ["start", "created", "archived", "end"]
+
+
+@pytest.mark.asyncio
+async def test_keyed_entries_overlap_across_keys_and_keep_order_within_a_key(
+    config, make_status
+):
+    handled = []
+    release = asyncio.Event()
+
+    async def blocked(message):
+        await release.wait()
+        handled.append(message)
+
+    async def unblock(message):
+        handled.append(message)
+        release.set()
+
+    async with _running_queue(config, 2) as queue:
+        # A burst on one key must not hold up the consumers: the other
+        # key's entry has to run while the whole burst is still waiting.
+        for index in range(8):
+            queue.put_nowait(blocked, make_status("a"), f"a{index}", key="a")
+
+        queue.put_nowait(unblock, make_status("b"), "b", key="b")
+
+        await _until(lambda: len(handled) >= 9)
+
+        assert queue.get_status().pending_events == 0
+        assert not queue.keyed
+
+    assert handled == ["b"] + [f"a{index}" for index in range(8)]
+
+
+@pytest.mark.asyncio
+async def test_keyed_entries_are_serialized_without_concurrency(config, make_status):
+    handled = []
+
+    async def handle(message):
+        await asyncio.sleep(0)
+        handled.append(message)
+
+    async with _running_queue(config, 1) as queue:
+        queue.put_nowait(handle, make_status("a"), "a", key="a")
+        queue.put_nowait(handle, make_status("ledger"), "ledger")
+        queue.put_nowait(handle, make_status("b"), "b", key="b")
+
+        await _until(lambda: len(handled) >= 3)
+
+    assert handled == ["a", "ledger", "b"]
+
+
+@pytest.mark.asyncio
+async def test_log_level_changes_apply_during_a_backlog(config, make_status, caplog):
+    # Records are captured at every level, but the logger starts out
+    # above debug, as a running integration would.
+    caplog.set_level(logging.DEBUG, logger=LOG.name)
+    LOG.setLevel(logging.INFO)
+    count = DRAIN_YIELD_INTERVAL * 2
+    handled = []
+
+    async def handle(index):
+        if index == 0:
+            LOG.setLevel(logging.DEBUG)
+
+        handled.append(index)
+
+    async with _running_queue(config, 1) as queue:
+        for index in range(count):
+            queue.put_nowait(handle, make_status(f"entry-{index}"), index)
+
+        await _until(lambda: len(handled) >= count)
+
+    processed = [
+        record.args[0]
+        for record in caplog.records
+        if record.msg == "Processing queue entry: %r"
+    ]
+    assert processed == [
+        f"entry-{index}" for index in range(DRAIN_YIELD_INTERVAL, count)
+    ]
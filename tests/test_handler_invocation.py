@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import pytest
+
+from daml_dit_if.main.common import (
+    as_handler_invocation,
+    with_marshalling,
+    without_return_value,
+)
+
+
+async def sample_handler(message):
+    """Handle a sample message."""
+    return []
+
+
+def test_handler_invocation_keeps_handler_metadata(make_status):
+    invocation = as_handler_invocation(None, make_status(), sample_handler)
+
+    for wrapped in (
+        invocation,
+        without_return_value(invocation),
+        with_marshalling(str, invocation),
+    ):
+        assert wrapped.__name__ == "sample_handler"
+        assert wrapped.__qualname__ == "sample_handler"
+        assert wrapped.__doc__ == "Handle a sample message."
+        assert wrapped.__module__ == sample_handler.__module__
+
+    assert invocation.__wrapped__ is sample_handler
+
+
+@pytest.mark.asyncio
+async def test_handler_invocation_records_use_and_errors(make_status):
+    status = make_status()
+
+    async def failing_handler(message):
+        raise ValueError(message)
+
+    await as_handler_invocation(None, status, sample_handler)("ok")
+    await as_handler_invocation(None, status, failing_handler)("bad")
+
+    assert status.use_count == 2
+    assert status.error_count == 1
+    assert status.error_message == "ValueError('bad')"
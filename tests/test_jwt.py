@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from aiohttp.web import Application, AppRunner
+
+from daml_dit_if.main.jwt import JWTValidator, TokenCache
+from daml_dit_if.main.web import JWT_VALIDATOR_KEY, _close_jwt_validator
+
+
+@pytest.mark.asyncio
+async def test_validator_creates_resources_lazily_and_closes_them():
+    validator = JWTValidator(jwks_urls=[])
+
+    assert validator.executor is None
+    assert validator.session is None
+
+    executor = validator._get_executor()
+    session = validator._get_session()
+
+    assert validator._get_executor() is executor
+
+    await validator.close()
+
+    assert session.closed
+    assert executor._shutdown
+    assert validator.executor is None
+    assert validator.session is None
+
+
+@pytest.mark.asyncio
+async def test_validator_leaves_supplied_executor_running():
+    executor = ThreadPoolExecutor(max_workers=1)
+    validator = JWTValidator(jwks_urls=[], executor=executor)
+
+    await validator.close()
+
+    assert not executor._shutdown
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_validator_is_closed_with_the_application():
+    validator = JWTValidator(jwks_urls=[])
+    session = validator._get_session()
+
+    app = Application()
+    app[JWT_VALIDATOR_KEY] = validator
+    app.on_cleanup.append(_close_jwt_validator)
+
+    runner = AppRunner(app)
+    await runner.setup()
+    await runner.cleanup()
+
+    assert session.closed
+
+
+def test_token_cache_expiry_and_eviction():
+    cache = TokenCache(maxsize=2)
+
+    cache.put(b"a", 1)
+    cache.put(b"b", 2, exp=0)
+    cache.put(b"c", 3)
+
+    assert cache.get(b"a") is None
+    assert cache.get(b"b") is None
+    assert cache.get(b"c") == 3
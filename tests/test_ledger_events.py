@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import copy
+import pickle
+
+import pytest
+
+import daml_dit_if.main  # noqa: F401  (daml_dit_if.api must follow main)
+from daml_dit_if.api import (
+    IntegrationLedgerContractArchiveEvent,
+    IntegrationLedgerContractCreateEvent,
+    IntegrationLedgerTransactionEndEvent,
+    IntegrationLedgerTransactionStartEvent,
+)
+
+
+def _events():
+    create = IntegrationLedgerContractCreateEvent(
+        cid="#1:0", initial=False, cdata={"owner": "Alice"}
+    )
+    archive = IntegrationLedgerContractArchiveEvent(cid="#0:0")
+
+    end = IntegrationLedgerTransactionEndEvent(
+        command_id="cmd", workflow_id="wf", contract_events=[create, archive]
+    )
+
+    # Populate the lazily computed partition, so that it is part of the
+    # state being copied.
+    assert end.created_cids == ("#1:0",)
+
+    start = IntegrationLedgerTransactionStartEvent(
+        command_id="cmd", workflow_id="wf", contract_events=[]
+    )
+
+    return [create, archive, start, end]
+
+
+@pytest.mark.parametrize(
+    "duplicate",
+    [copy.copy, copy.deepcopy, lambda event: pickle.loads(pickle.dumps(event))],
+    ids=["copy", "deepcopy", "pickle"],
+)
+def test_ledger_events_round_trip(duplicate):
+    for event in _events():
+        duplicated = duplicate(event)
+
+        assert duplicated == event
+        assert type(duplicated) is type(event)
+
+
+def test_transaction_event_partition_survives_round_trip():
+    end = _events()[-1]
+
+    duplicated = pickle.loads(pickle.dumps(end))
+
+    assert duplicated.created_cids == ("#1:0",)
+    assert duplicated.created_cdata == ({"owner": "Alice"},)
+    assert duplicated.archived_cids == ("#0:0",)
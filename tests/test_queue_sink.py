@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import replace
+
+import pytest
+
+from daml_dit_if.main.integration_deferral_queue import IntegrationDeferralQueue
+from daml_dit_if.main.integration_queue_context import (
+    BatchingQueueSink,
+    IntegrationQueueSinkImpl,
+)
+
+
+async def _handler(message):
+    pass
+
+
+@pytest.fixture
+def make_sink(config, make_status):
+    def make(sink_class, queue_size=0, **kwargs):
+        deferral_queue = IntegrationDeferralQueue(
+            replace(config, queue_size=queue_size, queue_concurrency=1)
+        )
+        status = make_status()
+
+        async def enqueue(message):
+            await deferral_queue.put(_handler, status, message)
+
+        sink = sink_class(
+            {"default": (enqueue, status)},
+            {"default": _handler},
+            deferral_queue,
+            **kwargs,
+        )
+
+        return sink, deferral_queue
+
+    return make
+
+
+def test_put_nowait_defers_the_handler(make_sink):
+    sink, deferral_queue = make_sink(IntegrationQueueSinkImpl)
+
+    sink.put_nowait("hello")
+
+    [entry] = deferral_queue.entries
+    assert entry.action is _handler
+    assert entry.args == ("hello",)
+
+
+@pytest.mark.asyncio
+async def test_put_nowait_matches_put(make_sink):
+    sink, deferral_queue = make_sink(IntegrationQueueSinkImpl)
+
+    sink.put_nowait("one")
+    await sink.put("two")
+
+    assert [entry.args for entry in deferral_queue.entries] == [("one",), ("two",)]
+
+
+def test_put_nowait_unknown_queue(make_sink):
+    sink, _ = make_sink(IntegrationQueueSinkImpl)
+
+    with pytest.raises(Exception, match="Unknown queue: missing"):
+        sink.put_nowait("hello", "missing")
+
+
+def test_put_nowait_queue_full(make_sink):
+    sink, deferral_queue = make_sink(IntegrationQueueSinkImpl, queue_size=1)
+
+    sink.put_nowait("one")
+
+    with pytest.raises(asyncio.QueueFull):
+        sink.put_nowait("two")
+
+    assert deferral_queue.skipped_events == 1
+
+
+@pytest.mark.asyncio
+async def test_batching_put_nowait_flushes_full_batches(make_sink):
+    sink, deferral_queue = make_sink(
+        BatchingQueueSink, batch_size=2, batch_timeout=60.0
+    )
+
+    sink.put_nowait("one")
+    assert not deferral_queue.entries
+
+    sink.put_nowait("two")
+
+    [entry] = deferral_queue.entries
+    assert entry.args == (_handler, ["one", "two"])
+    assert not sink.timers
+
+
+@pytest.mark.asyncio
+async def test_batching_put_nowait_raises_when_the_queue_is_full(make_sink):
+    sink, deferral_queue = make_sink(
+        BatchingQueueSink, queue_size=3, batch_size=2, batch_timeout=60.0
+    )
+
+    for message in ["one", "two", "three"]:
+        sink.put_nowait(message)
+
+    with pytest.raises(asyncio.QueueFull):
+        sink.put_nowait("four")
+
+    sink._flush("default")
+
+    assert [entry.args for entry in deferral_queue.entries] == [
+        (_handler, ["one", "two"]),
+        (_handler, ["three"]),
+    ]
+
+    status = deferral_queue.get_status()
+    assert status.total_events == 4
+    assert status.pending_events == 3
+    assert status.skipped_events == 1
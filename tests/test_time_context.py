@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import suppress
+
+import pytest
+
+from daml_dit_if.main.integration_time_context import IntegrationTimeContext
+
+# The scheduler's sleeps are replaced by the fake clock below, so the
+# tests yield to it through the real sleep.
+_yield = asyncio.sleep
+
+
+class _Clock:
+    """
+    Stands in for the event loop clock. Sleeping advances the clock by
+    the requested delay at once, and counts scheduler passes.
+    """
+
+    def __init__(self):
+        self.now = 0.0
+        self.passes = 0
+
+    def time(self) -> float:
+        return self.now
+
+    async def sleep(self, delay):
+        self.passes += 1
+        self.now += max(delay, 0)
+        await _yield(0)
+
+
+class _Queue:
+    def __init__(self, clock, full=()):
+        self.clock = clock
+        self.full = frozenset(full)
+        self.puts = []
+        self.passes = []
+
+    async def put(self, action, status, *args):
+        self.puts.append((self.clock.now, status.label))
+        self.passes.append(self.clock.passes)
+
+        if status.label in self.full:
+            raise asyncio.QueueFull()
+
+
+async def _handler():
+    pass
+
+
+def _context(queue, **intervals):
+    context = IntegrationTimeContext(queue, None)
+
+    for label, seconds in intervals.items():
+        context.periodic_interval(seconds, label)(_handler)
+
+    return context
+
+
+async def _run_until(monkeypatch, clock, context, done):
+    monkeypatch.setattr(asyncio.get_running_loop(), "time", clock.time)
+    monkeypatch.setattr(asyncio, "sleep", clock.sleep)
+
+    await context.start()
+    try:
+        while not done():
+            await _yield(0)
+
+        assert not context.task.done()
+    finally:
+        context.task.cancel()
+        with suppress(asyncio.CancelledError):
+            await context.task
+
+        monkeypatch.undo()
+
+
+@pytest.mark.asyncio
+async def test_timers_fire_in_order_and_rearm_at_a_fixed_cadence(monkeypatch):
+    clock = _Clock()
+    queue = _Queue(clock)
+    context = _context(queue, a=2, b=3)
+
+    await _run_until(monkeypatch, clock, context, lambda: clock.now > 6)
+
+    assert queue.puts == [
+        (2, "a (2s)"),
+        (3, "b (3s)"),
+        (4, "a (2s)"),
+        (6, "a (2s)"),
+        (6, "b (3s)"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_zero_second_interval_fires_once_per_pass(monkeypatch):
+    clock = _Clock()
+    queue = _Queue(clock)
+    context = _context(queue, zero=0)
+
+    await _run_until(monkeypatch, clock, context, lambda: len(queue.puts) >= 4)
+
+    # Each pass sleeps, and so yields to the event loop, before the timer
+    # fires again.
+    assert queue.puts == [(0, "zero (0s)")] * 4
+    assert queue.passes == [1, 2, 3, 4]
+
+
+@pytest.mark.asyncio
+async def test_full_queue_does_not_stop_the_timers(monkeypatch):
+    clock = _Clock()
+    queue = _Queue(clock, full={"a (2s)"})
+    context = _context(queue, a=2, b=3)
+
+    await _run_until(monkeypatch, clock, context, lambda: clock.now > 6)
+
+    assert queue.puts == [
+        (2, "a (2s)"),
+        (3, "b (3s)"),
+        (4, "a (2s)"),
+        (6, "a (2s)"),
+        (6, "b (3s)"),
+    ]
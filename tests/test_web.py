@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import json
+import re
+from contextlib import asynccontextmanager
+from datetime import datetime
+
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+from aiohttp.web import Application
+
+from daml_dit_if.main.auth_handler import AuthHandler
+from daml_dit_if.main.common import IntegrationQueueStatus, InvocationStatus
+from daml_dit_if.main.integration_context import IntegrationStatus
+from daml_dit_if.main.log import get_log_level_options
+from daml_dit_if.main.web import _add_control_routes, _log_suppressed_route
+
+
+class _StatusContext:
+    def __init__(self):
+        self.status_count = 0
+
+    def get_status(self) -> IntegrationStatus:
+        self.status_count += 1
+
+        return IntegrationStatus(
+            running=True,
+            start_time=datetime(2020, 1, 1),
+            error_message=None,
+            error_time=None,
+            pending_events=0,
+            event_queue=IntegrationQueueStatus(
+                queue_size=512, total_events=0, pending_events=0, skipped_events=0
+            ),
+            webhooks=[],
+            ledger_events=[],
+            timers=[
+                InvocationStatus(
+                    index=0,
+                    label="tick",
+                    command_count=0,
+                    use_count=0,
+                    error_count=0,
+                    error_message=None,
+                    error_time=None,
+                )
+            ],
+            queues=[],
+        )
+
+
+@asynccontextmanager
+async def _client(config, context):
+    app = Application()
+
+    auth_handler = AuthHandler(config, None)
+
+    await auth_handler.setup(app)
+    _add_control_routes(app, auth_handler, context)
+
+    async with TestClient(TestServer(app)) as client:
+        yield client
+
+
+@pytest.mark.asyncio
+async def test_status_responses(config):
+    context = _StatusContext()
+
+    async with _client(config, context) as client:
+        for path in ("/status", "/healthz?probe=1"):
+            response = await client.get(path)
+
+            assert response.status == 200
+            assert response.content_type == "application/json"
+
+            status = json.loads(await response.text())
+
+            assert status["_self"] == str(client.make_url(path))
+            assert status["running"] is True
+            assert status["timers"][0]["label"] == "tick"
+            assert status["log_level_options"][0] == {"label": "Runtime", "value": 0}
+
+    # Polls in quick succession are served from one status snapshot.
+    assert context.status_count == 1
+
+
+def test_log_level_options_are_not_shared():
+    options = get_log_level_options()
+    options[0]["label"] = "Changed"
+    options.clear()
+
+    assert get_log_level_options()[0] == {"label": "Runtime", "value": 0}
+
+
+@pytest.mark.asyncio
+async def test_log_level_resets_status_cache(config):
+    context = _StatusContext()
+
+    async with _client(config, context) as client:
+        await client.get("/status")
+
+        response = await client.post("/log-level", json={"log_level": 10})
+        assert response.status == 200
+
+        status = json.loads(await (await client.get("/status")).text())
+
+        assert status["log_level"] == 10
+        assert context.status_count == 2
+
+        await client.post("/log-level", json={"log_level": 0})
+
+
+@pytest.mark.asyncio
+async def test_prefixed_control_routes_require_authorization(config):
+    async with _client(config, _StatusContext()) as client:
+        response = await client.get("/integration/some-id/status")
+
+        assert response.status == 401
+
+
+# The expression _log_suppressed_route stands in for.
+LOG_SUPPRESSED_ROUTE_REGEX = re.compile(
+    r"^(/integration/[\w]+)?/((healthz)|(status)|(metrics))$"
+)
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "/healthz",
+        "/status",
+        "/metrics",
+        "/integration/abc_123/healthz",
+        "/integration/_/status",
+        "/integration/\u00e9t\u00e9/metrics",
+        "/integration//status",
+        "/integration/a-b/status",
+        "/integration/a/b/status",
+        "/integration/abc/other",
+        "/integration/status",
+        "/other/abc/status",
+        "/status/",
+        "status",
+        "/",
+        "",
+    ],
+)
+def test_log_suppressed_route_matches_regex(path):
+    expected = LOG_SUPPRESSED_ROUTE_REGEX.match(path) is not None
+
+    assert _log_suppressed_route(path) is expected
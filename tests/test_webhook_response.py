@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import json
+
+from aiohttp.web import Response
+
+import daml_dit_if.main  # noqa: F401  (daml_dit_if.api must follow main)
+from daml_dit_if.api import IntegrationWebhookResponse
+from daml_dit_if.main.integration_webhook_context import get_http_response
+
+
+def test_json_response_wins_over_text_and_blob():
+    response = get_http_response(
+        IntegrationWebhookResponse(
+            json_response={"a": 1}, text_response="hello", blob_response=b"blob"
+        )
+    )
+
+    assert response.content_type == "application/json"
+    assert json.loads(response.body) == {"a": 1}
+
+
+def test_unset_json_response_is_an_empty_json_reply():
+    response = get_http_response(IntegrationWebhookResponse(http_status=204))
+
+    assert response.status == 204
+    assert response.content_type == "application/json"
+    assert not response.body
+
+
+def test_explicit_response_wins_over_every_field():
+    explicit = Response(text="explicit")
+
+    response = get_http_response(
+        IntegrationWebhookResponse(
+            response=explicit,
+            json_response={"a": 1},
+            text_response="hello",
+            blob_response=b"blob",
+        )
+    )
+
+    assert response is explicit
+
+
+def test_each_response_has_its_own_command_list():
+    first = IntegrationWebhookResponse()
+    second = IntegrationWebhookResponse()
+
+    first.commands.append("command")
+
+    assert first.commands == ["command"]
+    assert second.commands == []